@@ -8,12 +8,77 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 import re
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
+import json
 import os
+import sys
+
+
+def _child_text(element, tag: str, default: str = ''):
+    """Text of the first `tag` child (None if it has no text), or `default` if there is none"""
+    child = element.find(tag)
+    return child.text if child is not None else default
+
+
+def _shared_text(element, tag: str, default: str = ''):
+    """_child_text for values repeated across many elements (GUIDs, family
+    names); interned so every repeat shares one string object"""
+    text = _child_text(element, tag, default)
+    return sys.intern(text) if text else text
+
+
+def _intern(value):
+    """sys.intern for strings read back from a saved index; anything else as is"""
+    return sys.intern(value) if isinstance(value, str) and value else value
+
 
 class EHXInteractiveSearch:
     """Interactive search interface for EHX files"""
 
+    # command word (or its shortcut) -> handler method taking the rest of the query
+    _COMMANDS = {
+        'panels': '_search_panels', 'p': '_search_panels',
+        'materials': '_search_materials', 'm': '_search_materials',
+        'bundles': '_search_bundles', 'b': '_search_bundles',
+        'sheathing': '_search_sheathing', 's': '_search_sheathing',
+        'detail': '_show_detail', 'd': '_show_detail',
+        'count': '_count_items', 'c': '_count_items',
+    }
+
+    # shown for 'help' and for an empty query
+    _HELP_TEXT = """
+=== EHX Interactive Search Help ===
+
+SEARCH COMMANDS:
+  [panel_name]          - Search for specific panel (e.g., "07_103")
+  panels [term]         - Search panels by name or partial match
+  materials [type]      - Search materials by type (e.g., "header", "sheathing")
+  bundles [name]        - Search bundles by name
+  sheathing [panel]     - Show sheathing details for panel
+  detail [item]         - Show detailed information for item
+  count [type]          - Count items by type
+
+SHORTCUTS:
+  p [term]             - Same as 'panels'
+  m [type]             - Same as 'materials'
+  b [name]             - Same as 'bundles'
+  s [panel]            - Same as 'sheathing'
+  d [item]             - Same as 'detail'
+  c [type]             - Same as 'count'
+
+EXAMPLES:
+  07_103               - Show panel 07_103 details
+  panels 07            - Show all panels starting with 07
+  materials header     - Show all headers
+  sheathing 07_103     - Show sheathing for panel 07_103
+  bundles tall         - Show bundles with "tall" in name
+  count sheathing      - Count all sheathing pieces
+  detail 07_103        - Show complete details for panel 07_103
+
+Type 'quit' or 'exit' to end session.
+        """
+
     def __init__(self, ehx_file_path: str):
         """Initialize with EHX file path"""
         self.file_path = Path(ehx_file_path)
@@ -21,94 +86,187 @@ class EHXInteractiveSearch:
             raise FileNotFoundError(f"EHX file not found: {ehx_file_path}")
 
         print(f"Loading EHX file: {ehx_file_path}")
-        self.tree = ET.parse(ehx_file_path)
-        self.root = self.tree.getroot()
 
-        # Build search indexes for faster queries
-        self._build_indexes()
+        # Build search indexes for faster queries (streams the file once),
+        # unless an index saved by an earlier run still matches the file.
+        # Stat before building so an edit made mid-build leaves a stale stamp.
+        stamp = self._index_stamp()
+        if not self._load_saved_indexes(stamp):
+            self._build_indexes()
+            self._save_indexes(stamp)
+        # indexes are read-only from here on, so answers can be reused per instance
+        self._cached_dispatch = lru_cache(maxsize=256)(self._dispatch)
         print("Ready for interactive search!")
 
+    # bump whenever the index layout changes so older saved indexes are rebuilt
+    _INDEX_VERSION = 2
+
+    def _index_path(self) -> Path:
+        return self.file_path.with_name(self.file_path.name + '.idx.json')
+
+    def _index_stamp(self) -> List:
+        st = self.file_path.stat()
+        return [self._INDEX_VERSION, st.st_mtime_ns, st.st_size]
+
+    def _load_saved_indexes(self, stamp: List) -> bool:
+        """Load indexes saved next to the EHX file; False if missing, stale or malformed"""
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as fh:
+                saved = json.load(fh)
+            if saved.get('stamp') != stamp:
+                return False
+            panel_index = {label: {k: _intern(v) for k, v in info.items()}
+                           for label, info in saved['panel_index'].items()}
+            bundle_index = saved['bundle_index']
+            entries = []
+            for material_type, item in saved['materials']:
+                item['family'] = _intern(item['family'])
+                item['panel_guid'] = _intern(item['panel_guid'])
+                entries.append((_intern(material_type), item))
+        except Exception:
+            return False
+        self.panel_index = panel_index
+        self.bundle_index = bundle_index
+        self._index_materials(entries)
+        return True
+
+    def _save_indexes(self, stamp: List):
+        """Save the built indexes next to the EHX file as JSON (best effort)"""
+        try:
+            saved = {
+                'stamp': stamp,
+                'panel_index': self.panel_index,
+                'bundle_index': self.bundle_index,
+                # (material_type, item) in index order; the by-type and by-panel
+                # maps and the search lists are rebuilt from these on load
+                'materials': self._material_entries,
+            }
+            path = self._index_path()
+            tmp = path.with_name(path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump(saved, fh)
+            # swap in whole so a reader never sees a half-written index
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
     def _build_indexes(self):
-        """Build indexes for fast searching"""
+        """Build indexes for fast searching in a single iterparse pass"""
         self.panel_index = {}  # panel_label -> panel_info
-        self.material_index = defaultdict(list)  # material_type -> list of items
         self.bundle_index = {}  # bundle_guid -> bundle_info
 
-        # Index panels
-        for panel in self.root.findall('.//Panel'):
-            label = panel.find('Label')
-            if label is not None and label.text:
-                self.panel_index[label.text] = {
-                    'guid': panel.find('PanelGuid').text if panel.find('PanelGuid') is not None else '',
-                    'bundle_guid': panel.find('BundleGuid').text if panel.find('BundleGuid') is not None else '',
-                    'level_guid': panel.find('LevelGuid').text if panel.find('LevelGuid') is not None else ''
-                }
-
-        # Index materials by type
-        for board in self.root.findall('.//Board'):
-            self._index_material(board, 'Board')
-
-        for sheet in self.root.findall('.//Sheet'):
-            self._index_material(sheet, 'Sheet')
-
-        for bracing in self.root.findall('.//Bracing'):
-            self._index_material(bracing, 'Bracing')
+        # Material entries are collected per element type and indexed after the
+        # pass, all Boards then Sheets then Bracing, so each list keeps that order
+        materials = {'Board': [], 'Sheet': [], 'Bracing': []}
+        bundle_panels = defaultdict(list)  # bundle_guid -> [(bundle_name, has_label, label)]
+
+        for _, elem in ET.iterparse(str(self.file_path), events=('end',)):
+            tag = elem.tag
+            if tag == 'Panel':
+                self._index_panel(elem, bundle_panels)
+            elif tag in materials:
+                entry = self._material_entry(elem, tag)
+                if entry is not None:
+                    materials[tag].append(entry)
+            else:
+                continue
+            # only strings are kept from panels and materials, so free the subtree
+            elem.clear()
 
         # Index bundles
-        bundle_panels = defaultdict(list)
-        for panel in self.root.findall('.//Panel'):
-            bundle_guid = panel.find('BundleGuid')
-            if bundle_guid is not None and bundle_guid.text:
-                bundle_panels[bundle_guid.text].append(panel)
-
         for bundle_guid, panels in bundle_panels.items():
-            bundle_name = panels[0].find('BundleName').text if panels[0].find('BundleName') is not None else f"Bundle {bundle_guid[:8]}"
             self.bundle_index[bundle_guid] = {
-                'name': bundle_name,
+                'name': panels[0][0],
                 'panel_count': len(panels),
-                'panels': [p.find('Label').text for p in panels if p.find('Label') is not None]
+                'panels': [label for _, has_label, label in panels if has_label]
             }
 
-    def _index_material(self, element, element_type: str):
-        """Index a material element"""
+        self._index_materials([entry for entries in materials.values() for entry in entries])
+
+    def _index_materials(self, entries: List[Tuple[str, Dict]]):
+        """Index (material_type, item) entries and build the lookup tables over
+        panel_index, bundle_index and the materials; shared by build and load"""
+        self._material_entries = entries
+        self.material_index = defaultdict(list)  # material_type -> list of items
+        self.materials_by_panel_guid = defaultdict(list)  # panel_guid -> list of items
+
+        # Index materials by type
+        for material_type, item in entries:
+            self.material_index[material_type].append(item)
+            self.materials_by_panel_guid[item['panel_guid']].append(item)
+
+        # case-folded label -> label, so lookups match panels in any case
+        self._panel_by_ci = {label.casefold(): label for label in self.panel_index}
+
+        # lower-cased keys for the substring searches, each with its result
+        # line already formatted; built once per file
+        self._panel_labels_lc = [
+            (label.lower(), f"  {label} (Bundle: {(info['bundle_guid'] or '')[:8]}...)")
+            for label, info in self.panel_index.items()
+        ]
+        self._material_types_lc = [
+            ((t or '').lower(), t, f"  {t}: {len(items)} pieces")
+            for t, items in self.material_index.items()
+        ]
+        self._bundles_lc = [
+            ((info['name'] or '').lower(),
+             f"  {info['name']} ({info['panel_count']} panels): {', '.join(map(str, info['panels'][:3]))}{'...' if len(info['panels']) > 3 else ''}")
+            for info in self.bundle_index.values()
+        ]
+
+    def _index_panel(self, panel, bundle_panels):
+        """Index a panel element and record it under its bundle"""
+        label = panel.find('Label')
+        bundle_guid = _shared_text(panel, 'BundleGuid')
+        if label is not None and label.text:
+            self.panel_index[label.text] = {
+                'guid': _shared_text(panel, 'PanelGuid'),
+                'bundle_guid': bundle_guid,
+                'level_guid': _shared_text(panel, 'LevelGuid')
+            }
+
+        if bundle_guid:
+            bundle_panels[bundle_guid].append((
+                _child_text(panel, 'BundleName', f"Bundle {bundle_guid[:8]}"),
+                label is not None,
+                label.text if label is not None else None,
+            ))
+
+    def _material_entry(self, element, element_type: str) -> Optional[Tuple[str, Dict]]:
+        """Extract (material_type, item) from a material element, or None if it has no type"""
         family_name = element.find('FamilyMemberName')
-        if family_name is not None:
-            material_type = family_name.text
-            self.material_index[material_type].append({
-                'type': element_type,
-                'element': element,
-                'panel_guid': element.find('PanelGuid').text if element.find('PanelGuid') is not None else '',
-                'guid': element.find(f'{element_type}Guid').text if element.find(f'{element_type}Guid') is not None else ''
-            })
+        if family_name is None:
+            return None
+        material = element.find('Material')
+        family = sys.intern(family_name.text) if family_name.text else family_name.text
+        return family, {
+            'type': element_type,
+            'family': family,
+            'panel_guid': _shared_text(element, 'PanelGuid'),
+            'guid': _child_text(element, f'{element_type}Guid'),
+            # None when the element is missing (sheathing listing skips those)
+            'label': element.findtext('Label'),
+            'description': material.findtext('Description') if material is not None else None
+        }
 
     def search(self, query: str) -> str:
         """Process a search query and return results"""
-        query = query.strip().lower()
+        return self._cached_dispatch(query.strip().lower())
 
+    def _dispatch(self, query: str) -> str:
+        """Answer a normalized (stripped, lower-cased) query"""
         if not query:
             return self._show_help()
 
-        # Parse query for commands
-        if query.startswith('help'):
+        # Parse query for commands: the first word picks the handler, the rest is its argument
+        parts = query.split(None, 1)
+        command = parts[0]
+        if command == 'help':
             return self._show_help()
 
-        elif query.startswith('panels') or query == 'p':
-            return self._search_panels(query.replace('panels', '').replace('p', '').strip())
-
-        elif query.startswith('materials') or query == 'm':
-            return self._search_materials(query.replace('materials', '').replace('m', '').strip())
-
-        elif query.startswith('bundles') or query == 'b':
-            return self._search_bundles(query.replace('bundles', '').replace('b', '').strip())
-
-        elif query.startswith('sheathing') or query == 's':
-            return self._search_sheathing(query.replace('sheathing', '').replace('s', '').strip())
-
-        elif query.startswith('detail') or query == 'd':
-            return self._show_detail(query.replace('detail', '').replace('d', '').strip())
-
-        elif query.startswith('count') or query == 'c':
-            return self._count_items(query.replace('count', '').replace('c', '').strip())
+        handler = self._COMMANDS.get(command)
+        if handler is not None:
+            return getattr(self, handler)(parts[1] if len(parts) > 1 else '')
 
         else:
             # Try to interpret as panel search first, then material search
@@ -121,37 +279,7 @@ class EHXInteractiveSearch:
 
     def _show_help(self) -> str:
         """Show available commands"""
-        return """
-=== EHX Interactive Search Help ===
-
-SEARCH COMMANDS:
-  [panel_name]          - Search for specific panel (e.g., "07_103")
-  panels [term]         - Search panels by name or partial match
-  materials [type]      - Search materials by type (e.g., "header", "sheathing")
-  bundles [name]        - Search bundles by name
-  sheathing [panel]     - Show sheathing details for panel
-  detail [item]         - Show detailed information for item
-  count [type]          - Count items by type
-
-SHORTCUTS:
-  p [term]             - Same as 'panels'
-  m [type]             - Same as 'materials'
-  b [name]             - Same as 'bundles'
-  s [panel]            - Same as 'sheathing'
-  d [item]             - Same as 'detail'
-  c [type]             - Same as 'count'
-
-EXAMPLES:
-  07_103               - Show panel 07_103 details
-  panels 07            - Show all panels starting with 07
-  materials header     - Show all headers
-  sheathing 07_103     - Show sheathing for panel 07_103
-  bundles tall         - Show bundles with "tall" in name
-  count sheathing      - Count all sheathing pieces
-  detail 07_103        - Show complete details for panel 07_103
-
-Type 'quit' or 'exit' to end session.
-        """
+        return self._HELP_TEXT
 
     def _search_panels(self, query: str) -> str:
         """Search for panels"""
@@ -163,10 +291,7 @@ Type 'quit' or 'exit' to end session.
             return f"=== All Panels ({len(results)}) ===\n" + "\n".join(results)
 
         # Search by partial match
-        results = []
-        for label, info in self.panel_index.items():
-            if query in label.lower():
-                results.append(f"  {label} (Bundle: {info['bundle_guid'][:8]}...)")
+        results = [line for label_lc, line in self._panel_labels_lc if query in label_lc]
 
         if results:
             return f"=== Panels matching '{query}' ({len(results)}) ===\n" + "\n".join(results)
@@ -181,10 +306,7 @@ Type 'quit' or 'exit' to end session.
             return f"=== Material Types ({len(types)}) ===\n" + "\n".join(f"  {t} ({len(self.material_index[t])})" for t in types)
 
         # Search by material type
-        results = []
-        for material_type, items in self.material_index.items():
-            if query in material_type.lower():
-                results.append(f"  {material_type}: {len(items)} pieces")
+        results = [line for material_type_lc, _, line in self._material_types_lc if query in material_type_lc]
 
         if results:
             return f"=== Materials matching '{query}' ===\n" + "\n".join(results)
@@ -201,10 +323,7 @@ Type 'quit' or 'exit' to end session.
             return f"=== All Bundles ({len(results)}) ===\n" + "\n".join(results)
 
         # Search by name
-        results = []
-        for guid, info in self.bundle_index.items():
-            if query in info['name'].lower():
-                results.append(f"  {info['name']} ({info['panel_count']} panels): {', '.join(info['panels'][:3])}{'...' if len(info['panels']) > 3 else ''}")
+        results = [line for name_lc, line in self._bundles_lc if query in name_lc]
 
         if results:
             return f"=== Bundles matching '{query}' ({len(results)}) ===\n" + "\n".join(results)
@@ -216,21 +335,17 @@ Type 'quit' or 'exit' to end session.
         if not query:
             return "Please specify a panel name (e.g., 'sheathing 07_103')"
 
-        panel_info = self.panel_index.get(query.upper())
+        label = self._panel_by_ci.get(query.casefold())
+        panel_info = self.panel_index.get(label)
         if not panel_info:
             return f"Panel '{query}' not found"
 
         # Find sheathing for this panel
         sheathing = []
-        for item in self.material_index.get('Sheathing', []):
-            if item['panel_guid'] == panel_info['guid']:
-                element = item['element']
-                material_elem = element.find('Material')
-                if material_elem is not None:
-                    desc = material_elem.find('Description')
-                    label = element.find('Label')
-                    if desc is not None and label is not None:
-                        sheathing.append(f"  {label.text}: {desc.text}")
+        for item in self.materials_by_panel_guid.get(panel_info['guid'], []):
+            if item['family'] == 'Sheathing':
+                if item['description'] is not None and item['label'] is not None:
+                    sheathing.append(f"  {item['label']}: {item['description']}")
 
         if sheathing:
             return f"=== Sheathing for Panel {query} ({len(sheathing)} pieces) ===\n" + "\n".join(sheathing)
@@ -243,16 +358,13 @@ Type 'quit' or 'exit' to end session.
             return "Please specify what to show details for (e.g., 'detail 07_103')"
 
         # Try panel first
-        if query.upper() in self.panel_index:
-            panel_info = self.panel_index[query.upper()]
+        label = self._panel_by_ci.get(query.casefold())
+        if label is not None:
+            panel_info = self.panel_index[label]
             bundle_info = self.bundle_index.get(panel_info['bundle_guid'], {})
 
             # Count materials for this panel
-            material_counts = defaultdict(int)
-            for material_type, items in self.material_index.items():
-                for item in items:
-                    if item['panel_guid'] == panel_info['guid']:
-                        material_counts[material_type] += 1
+            material_counts = Counter(item['family'] for item in self.materials_by_panel_guid.get(panel_info['guid'], ()))
 
             result = f"""
 === Detailed Information for Panel {query} ===
@@ -293,8 +405,8 @@ Material Types: {len(self.material_index)}
 
         # Count specific material type (case-insensitive search)
         query_lower = query.lower()
-        for material_type in self.material_index:
-            if query_lower in material_type.lower():
+        for material_type_lc, material_type, _ in self._material_types_lc:
+            if query_lower in material_type_lc:
                 count = len(self.material_index[material_type])
                 return f"Total {material_type} pieces: {count}"
 
@@ -336,8 +448,6 @@ def interactive_search(ehx_file_path: str):
 
 def main():
     """Main entry point"""
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python ehx_interactive_search.py <ehx_file>")
         print("Example: python ehx_interactive_search.py 07-103-104.EHX")
@@ -10,39 +10,78 @@ import json
 import xml.etree.ElementTree as ET
 import datetime as _dt
 import re
+import mmap
+import sys
+import importlib.util
+from math import gcd
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+try:
+    # lxml is optional; when present it parses EHX files and runs the
+    # precompiled descendant queries below in C
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+if _lxml_etree is not None:
+    _XP_BOARD = _lxml_etree.XPath('.//Board')
+    _XP_SHEET = _lxml_etree.XPath('.//Sheet')
+    _XP_BRACING = _lxml_etree.XPath('.//Bracing')
+    # SubAssemblies with a family-ish child mentioning RoughOpening (any case);
+    # a superset of what parse_materials_from_panel keeps, so the exact
+    # check still runs on the few nodes that get through
+    _XP_RO_SUBASSEMBLY = _lxml_etree.XPath(
+        './/SubAssembly[*[self::FamilyMemberName or self::Family or self::FamilyName or self::Type or self::Name]'
+        '[contains(translate(., "ROUGHPENIG", "roughpenig"), "roughopening")]]'
+    )
+else:
+    _XP_BOARD = _XP_SHEET = _XP_BRACING = _XP_RO_SUBASSEMBLY = None
+
+# material fields whose values repeat across a job ('Board', 'Header',
+# 'OSB 7/16', ...); parse_materials_from_panel interns them so equal values
+# share one string object
+_INTERNED_FIELDS = ('Type', 'FamilyMemberName', 'Label', 'SubAssembly', 'Desc', 'Description', 'Qty')
+
+# <JobPath> is written near the top of an EHX; only scan this many bytes for it
+_JOBPATH_SCAN_LIMIT = 40960
+_JOBPATH_RE = re.compile(rb'<JobPath>(.*?)</JobPath>', re.IGNORECASE | re.DOTALL)
+
+@lru_cache(maxsize=8192)
 def _nat_key(s):
     """Natural sort key: split digits and non-digits so strings with numbers sort naturally."""
+    # tuple so the cached key can't be mutated by a caller
     try:
         parts = re.split(r'(\d+)', (s or ''))
-        return [int(p) if p.isdigit() else p.lower() for p in parts]
+        return tuple(int(p) if p.isdigit() else p.lower() for p in parts)
     except Exception:
-        return [s]
+        return (s,)
+
+
+# reduced fraction text for 0..7 eighths of an inch
+_EIGHTHS = ('',) + tuple(f"{n // gcd(n, 8)}/{8 // gcd(n, 8)}\"" for n in range(1, 8))
+
+
 def inches_to_feet_inches_sixteenths(s):
     """Convert decimal inches to feet-inches-sixteenths format."""
     try:
         f = float(s)
     except Exception:
         return ''
+    # callers pass both strings and floats; cache on the parsed value
+    return _sixteenths_text(f)
+
+
+@lru_cache(maxsize=4096)
+def _sixteenths_text(f):
     try:
-        total_sixteenths = int(round(float(f) * 16))
+        total_sixteenths = int(round(f * 16))
     except Exception:
         return ''
     # Quantize to even sixteenths (favor common fractions like 1/8)
     total_sixteenths = int(round(total_sixteenths / 2.0) * 2)
-    feet = total_sixteenths // (12 * 16)
-    rem = total_sixteenths % (12 * 16)
-    inches_whole = rem // 16
-    sixteenths = rem % 16
-    if sixteenths == 0:
-        frac_part = ''
-    else:
-        num = sixteenths // 2
-        denom = 8
-        from math import gcd
-        g = gcd(num, denom)
-        num_r = num // g
-        denom_r = denom // g
-        frac_part = f"{num_r}/{denom_r}\""
+    feet, rem = divmod(total_sixteenths, 12 * 16)
+    inches_whole, sixteenths = divmod(rem, 16)
+    frac_part = _EIGHTHS[sixteenths // 2]
 
     if feet and inches_whole:
         if frac_part:
@@ -65,91 +104,308 @@ def inches_to_feet_inches_sixteenths(s):
     return ''
 
 
+def _descendants(el, xpath, tag):
+    """Return all `tag` descendants of `el`, using the precompiled lxml XPath
+    when `el` came from lxml and ElementTree's findall otherwise."""
+    if xpath is not None and isinstance(el, _lxml_etree._Element):
+        return xpath(el)
+    return el.findall('.//' + tag)
+
+
+def _first_children(el):
+    """Map each direct child tag of `el` to its first child with that tag.
+
+    One pass over the children replaces a find() per candidate tag name.
+    """
+    kids = {}
+    if el is not None:
+        for ch in el:
+            if ch.tag not in kids:
+                kids[ch.tag] = ch
+    return kids
+
+
+def _pick(kids, names):
+    """Return the stripped text of the first tag in `names` present in `kids`
+    (as built by _first_children); same priority rules as a find() chain."""
+    for n in names:
+        ch = kids.get(n)
+        if ch is not None and ch.text is not None:
+            return ch.text.strip()
+    return None
+
+
+def _material_child(node, kids):
+    """Return the node's <Material> child if it has content, else the node itself."""
+    mat_el = kids.get('Material')
+    if mat_el is None or not len(mat_el):
+        return node
+    return mat_el
+
+
 # Top-level helper: parse materials from a Panel element (lightweight copy of fallback parser)
 def parse_materials_from_panel(panel_el):
     try:
-        def _text_of(el, names):
-            if el is None:
-                return None
-            for n in names:
-                ch = el.find(n)
-                if ch is not None and ch.text is not None:
-                    return ch.text.strip()
-            return None
-
         mats = []
-        for node in panel_el.findall('.//Board'):
-            typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
-            fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-            label = _text_of(node, ('Label', 'LabelText')) or ''
-            sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-            mat_el = node.find('Material') or node
-            desc = _text_of(mat_el, ('Description', 'Desc', 'Material', 'Name')) or ''
-            qty = _text_of(mat_el, ('Quantity', 'QNT', 'Qty')) or '1'
-            length = _text_of(mat_el, ('ActualLength', 'Length')) or ''
-            width = _text_of(mat_el, ('ActualWidth', 'Width')) or ''
-            board_guid = _text_of(node, ('BoardGuid', 'BoardID')) or _text_of(mat_el, ('BoardGuid', 'BoardID'))
-            sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
+        for node in _descendants(panel_el, _XP_BOARD, 'Board'):
+            nk = _first_children(node)
+            typ = _pick(nk, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
+            fam = _pick(nk, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
+            label = _pick(nk, ('Label', 'LabelText')) or ''
+            sub = _pick(nk, ('SubAssembly', 'SubAssemblyName')) or ''
+            mat_el = _material_child(node, nk)
+            mk = nk if mat_el is node else _first_children(mat_el)
+            desc = _pick(mk, ('Description', 'Desc', 'Material', 'Name')) or ''
+            qty = _pick(mk, ('Quantity', 'QNT', 'Qty')) or '1'
+            length = _pick(mk, ('ActualLength', 'Length')) or ''
+            width = _pick(mk, ('ActualWidth', 'Width')) or ''
+            board_guid = _pick(nk, ('BoardGuid', 'BoardID')) or _pick(mk, ('BoardGuid', 'BoardID'))
+            sub_assembly_guid = _pick(nk, ('SubAssemblyGuid', 'SubAssemblyID'))
             mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': width, 'BoardGuid': board_guid, 'SubAssemblyGuid': sub_assembly_guid})
 
-        for node in panel_el.findall('.//Sheet'):
-            typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Sheathing'
-            fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-            label = _text_of(node, ('Label', 'LabelText')) or ''
-            sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-            mat_child = node.find('Material')
-            desc = ''
-            if mat_child is not None:
-                desc = _text_of(mat_child, ('Description', 'Desc', 'Material', 'Name')) or ''
+        for node in _descendants(panel_el, _XP_SHEET, 'Sheet'):
+            nk = _first_children(node)
+            typ = _pick(nk, ('FamilyMemberName', 'Type', 'Name')) or 'Sheathing'
+            fam = _pick(nk, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
+            label = _pick(nk, ('Label', 'LabelText')) or ''
+            sub = _pick(nk, ('SubAssembly', 'SubAssemblyName')) or ''
+            # empty when the sheet has no <Material> child
+            mk = _first_children(nk.get('Material'))
+            desc = _pick(mk, ('Description', 'Desc', 'Material', 'Name')) or ''
             if not desc:
-                desc = _text_of(node, ('TypeOfSheathing', 'Description', 'Desc', 'Material', 'Name', 'TypeOfFastener')) or ''
-            qty = _text_of(node, ('Quantity', 'QNT', 'Qty')) or '1'
-            length = ''
-            width = ''
-            if mat_child is not None:
-                length = _text_of(mat_child, ('ActualLength', 'Length')) or ''
-                width = _text_of(mat_child, ('ActualWidth', 'Width')) or ''
+                desc = _pick(nk, ('TypeOfSheathing', 'Description', 'Desc', 'Material', 'Name', 'TypeOfFastener')) or ''
+            qty = _pick(nk, ('Quantity', 'QNT', 'Qty')) or '1'
+            length = _pick(mk, ('ActualLength', 'Length')) or ''
+            width = _pick(mk, ('ActualWidth', 'Width')) or ''
             if not length:
-                length = _text_of(node, ('ActualLength', 'Length')) or ''
+                length = _pick(nk, ('ActualLength', 'Length')) or ''
             if not width:
-                width = _text_of(node, ('ActualWidth', 'Width')) or ''
-            sheet_guid = _text_of(node, ('SheetGuid', 'SheetID')) or (_text_of(mat_child, ('SheetGuid', 'SheetID')) if mat_child is not None else None)
-            sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
+                width = _pick(nk, ('ActualWidth', 'Width')) or ''
+            sheet_guid = _pick(nk, ('SheetGuid', 'SheetID')) or _pick(mk, ('SheetGuid', 'SheetID'))
+            sub_assembly_guid = _pick(nk, ('SubAssemblyGuid', 'SubAssemblyID'))
             mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Description': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': width, 'SheetGuid': sheet_guid, 'SubAssemblyGuid': sub_assembly_guid})
 
-        for node in panel_el.findall('.//Bracing'):
-            typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Bracing'
-            fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-            label = _text_of(node, ('Label', 'LabelText')) or ''
-            sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-            desc = _text_of(node, ('Description', 'Desc', 'Material', 'Name')) or ''
-            qty = _text_of(node, ('Quantity', 'QNT', 'Qty')) or '1'
-            length = _text_of(node, ('ActualLength', 'Length')) or ''
-            bracing_guid = _text_of(node, ('BracingGuid', 'BracingID'))
-            sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
+        for node in _descendants(panel_el, _XP_BRACING, 'Bracing'):
+            nk = _first_children(node)
+            typ = _pick(nk, ('FamilyMemberName', 'Type', 'Name')) or 'Bracing'
+            fam = _pick(nk, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
+            label = _pick(nk, ('Label', 'LabelText')) or ''
+            sub = _pick(nk, ('SubAssembly', 'SubAssemblyName')) or ''
+            desc = _pick(nk, ('Description', 'Desc', 'Material', 'Name')) or ''
+            qty = _pick(nk, ('Quantity', 'QNT', 'Qty')) or '1'
+            length = _pick(nk, ('ActualLength', 'Length')) or ''
+            bracing_guid = _pick(nk, ('BracingGuid', 'BracingID'))
+            sub_assembly_guid = _pick(nk, ('SubAssemblyGuid', 'SubAssemblyID'))
             mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': '', 'BracingGuid': bracing_guid, 'SubAssemblyGuid': sub_assembly_guid})
 
-        for sub_el in panel_el.findall('.//SubAssembly'):
-            fam = _text_of(sub_el, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or ''
-            sub_label = _text_of(sub_el, ('Label', 'LabelText')) or ''
-            sub_name = _text_of(sub_el, ('SubAssemblyName',)) or ''
-            sub_guid = _text_of(sub_el, ('SubAssemblyGuid', 'SubAssemblyID'))
+        for sub_el in _descendants(panel_el, _XP_RO_SUBASSEMBLY, 'SubAssembly'):
+            sk = _first_children(sub_el)
+            fam = _pick(sk, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or ''
             if fam and str(fam).strip().lower() == 'roughopening':
-                for b in sub_el.findall('.//Board'):
-                    btyp = _text_of(b, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
-                    blab = _text_of(b, ('Label', 'LabelText')) or ''
-                    mat_el = b.find('Material') or b
-                    bdesc = _text_of(mat_el, ('Description', 'Desc', 'Material', 'Name')) or ''
-                    bal = _text_of(mat_el, ('ActualLength', 'Length')) or ''
-                    baw = _text_of(mat_el, ('ActualWidth', 'Width')) or ''
-                    b_guid = _text_of(b, ('BoardGuid', 'BoardID'))
+                sub_name = _pick(sk, ('SubAssemblyName',)) or ''
+                sub_guid = _pick(sk, ('SubAssemblyGuid', 'SubAssemblyID'))
+                for b in _descendants(sub_el, _XP_BOARD, 'Board'):
+                    bk = _first_children(b)
+                    btyp = _pick(bk, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
+                    blab = _pick(bk, ('Label', 'LabelText')) or ''
+                    mat_el = _material_child(b, bk)
+                    mk = bk if mat_el is b else _first_children(mat_el)
+                    bdesc = _pick(mk, ('Description', 'Desc', 'Material', 'Name')) or ''
+                    bal = _pick(mk, ('ActualLength', 'Length')) or ''
+                    baw = _pick(mk, ('ActualWidth', 'Width')) or ''
+                    b_guid = _pick(bk, ('BoardGuid', 'BoardID'))
                     mats.append({'Type': btyp, 'FamilyMemberName': fam, 'Label': blab, 'SubAssembly': sub_name, 'Desc': bdesc, 'Qty': '', 'ActualLength': bal, 'ActualWidth': baw, 'BoardGuid': b_guid, 'SubAssemblyGuid': sub_guid})
 
+        # lowercase Type/FamilyMemberName once here so consumers don't re-lower them on every pass
+        for d in mats:
+            for k in _INTERNED_FIELDS:
+                v = d.get(k)
+                if isinstance(v, str):
+                    d[k] = sys.intern(v)
+            d['_type_lc'] = sys.intern((d.get('Type') or '').lower())
+            d['_family_lc'] = sys.intern((d.get('FamilyMemberName') or '').lower())
+            # both the rough-opening list and the breakdown filter ask this
+            d['_is_ro'] = _classify_rough_opening(d)
         return mats
     except Exception:
         return []
 
 
+def _material_type_lc(m):
+    """Lowercased material Type, preferring the copy cached at parse time."""
+    t = m.get('_type_lc')
+    if t is None:
+        t = (m.get('Type') or '').lower()
+    return t
+
+
+def _material_family_lc(m):
+    """Lowercased FamilyMemberName, preferring the copy cached at parse time."""
+    fam = m.get('_family_lc')
+    if fam is None:
+        fam = str(m.get('FamilyMemberName') or '').lower()
+    return fam
+
+
+def _is_sheathing(m):
+    """True for sheet/sheathing materials, by Type or FamilyMemberName."""
+    t = _material_type_lc(m)
+    return 'sheet' in t or 'sheath' in t or 'sheath' in _material_family_lc(m)
+
+
+def _sheathing_descriptions(materials):
+    """Unique sheathing descriptions in material order."""
+    seen = set()
+    descs = []
+    for m in materials:
+        if not isinstance(m, dict) or not _is_sheathing(m):
+            continue
+        # prefer the explicit <Description> element for sheathing text
+        desc = (m.get('Description') or m.get('Desc') or '').strip()
+        if desc and desc not in seen:
+            seen.add(desc)
+            descs.append(desc)
+    return descs
+
+
+def _panel_detail_materials(panel_obj, mats_list):
+    """(sheathing descriptions, rough-opening materials, header labels) for a
+    panel's filtered material list.
+
+    Cached on the panel dict as '_detail_mats'; reused while the list is the
+    same object and no material label has been rewritten since.
+    """
+    hit = panel_obj.get('_detail_mats')
+    if hit is not None and hit[0] is mats_list and hit[1] == _label_version:
+        return hit[2]
+    sheathing, rough_openings, _ = _partition_materials(mats_list)
+    headers = _header_labels(mats_list) if rough_openings else []
+    res = (sheathing, rough_openings, headers)
+    panel_obj['_detail_mats'] = (mats_list, _label_version, res)
+    return res
+
+
+def _panel_breakdown_materials(panel_obj, materials):
+    """A panel's materials without rough openings, for the breakdown pane.
+
+    `materials` may be a list or a mapping of lists (flattened). Cached on
+    the panel dict as '_breakdown_mats' under the same rules as
+    _panel_detail_materials.
+    """
+    hit = panel_obj.get('_breakdown_mats')
+    if hit is not None and hit[0] is materials and hit[1] == _label_version:
+        return hit[2]
+    mats_list = []
+    if isinstance(materials, dict):
+        # if it's a mapping of panel->materials, flatten values
+        for v in materials.values():
+            if isinstance(v, (list, tuple)):
+                mats_list.extend(v)
+    elif isinstance(materials, (list, tuple)):
+        mats_list = materials
+    res = [m for m in mats_list if not _is_rough_opening(m)]
+    panel_obj['_breakdown_mats'] = (materials, _label_version, res)
+    return res
+
+
+def _panel_label_parts(panel_obj, name):
+    """(display label, lot, panel number) for a panel, split on the first '_'.
+
+    Cached on the panel dict as '_label_parts' together with the label it was
+    computed from, so a changed DisplayLabel is picked up.
+    """
+    display = panel_obj.get('DisplayLabel', name)
+    hit = panel_obj.get('_label_parts')
+    if hit is not None and hit[0] == display:
+        return hit
+    lot_num = ''
+    panel_num = display
+    if '_' in display:
+        lot_num, panel_num = display.split('_', 1)
+    hit = panel_obj['_label_parts'] = (display, lot_num, panel_num)
+    return hit
+
+
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _button_text_from_display(name):
+    """Short panel label for tray buttons: the last 3 digits of the final
+    digit run, else the last 3 chars after the final '_' (or of the name)."""
+    try:
+        s = str(name or '')
+        # prefer digits: find last continuous digit sequence
+        m = _DIGITS_RE.findall(s)
+        if m:
+            return m[-1][-3:]
+        # fallback: use suffix after last '_' then last 3 chars
+        if '_' in s:
+            return s.rsplit('_', 1)[1][-3:]
+        return s[-3:]
+    except Exception:
+        return str(name)
+
+
+# Panel Details bullet fields and the panel keys they may come from; the
+# first key present wins, even if its value is empty
+_PANEL_DETAIL_FIELDS = (
+    ('Category', ('Category', 'PanelCategory', 'Type')),
+    ('Load Bearing', ('LoadBearing', 'IsLoadBearing', 'LoadBearingFlag')),
+    ('Wall Length', ('WallLength', 'Length', 'PanelLength')),
+    ('Height', ('Height', 'PanelHeight')),
+    ('Thickness', ('Thickness', 'Depth')),
+    ('Stud Spacing', ('StudSpacing', 'StudsPerFoot')),
+)
+
+
+def _panel_canon(panel_obj):
+    """Panel fields shown in Panel Details, resolved once from their
+    alternate key names and cached on the panel dict as '_canon'.
+
+    'Level', 'Description' and 'Weight' are only present when the panel has
+    them, matching the `in panel_obj` checks they replace.
+    """
+    canon = panel_obj.get('_canon')
+    if canon is not None:
+        return canon
+    canon = {}
+    for k in ('Level', 'Description', 'Weight'):
+        if k in panel_obj:
+            canon[k] = panel_obj.get(k)
+    canon['Bundle'] = panel_obj.get('Bundle') or panel_obj.get('BundleName') or panel_obj.get('BundleGuid') or ''
+    for label, keys in _PANEL_DETAIL_FIELDS:
+        val = ''
+        for k in keys:
+            if k in panel_obj:
+                val = panel_obj.get(k)
+                break
+        canon[label] = val
+    canon['LevelNo'] = panel_obj.get('LevelNo') or panel_obj.get('Level')
+    canon['Notes'] = panel_obj.get('OnScreenInstruction') or panel_obj.get('Notes') or panel_obj.get('Instruction')
+    panel_obj['_canon'] = canon
+    return canon
+
+
+def _partition_materials(materials):
+    """Split materials in one pass into (sheathing descriptions, rough
+    openings, everything else), each in material order."""
+    seen = set()
+    sheathing = []
+    rough_openings = []
+    rest = []
+    for m in materials:
+        if _is_rough_opening(m):
+            rough_openings.append(m)
+        else:
+            rest.append(m)
+        if isinstance(m, dict) and _is_sheathing(m):
+            desc = (m.get('Description') or m.get('Desc') or '').strip()
+            if desc and desc not in seen:
+                seen.add(desc)
+                sheathing.append(desc)
+    return sheathing, rough_openings, rest
+
+
 # Top-level GUID-first filter used by GUI and exporters
 def _filter_materials_by_guid(materials, panel_obj):
     try:
@@ -183,6 +439,23 @@ def _filter_materials_by_guid(materials, panel_obj):
             return materials
 
 
+# Filtered material lists keyed by (id(materials), panel guid). The source list
+# is stored alongside the result so a recycled id can never return a stale hit.
+# Cleared whenever the loaded panels change.
+_filter_cache = {}
+
+
+def _filter_materials_by_guid_cached(materials, panel_obj):
+    panel_guid = None
+    if isinstance(panel_obj, dict):
+        panel_guid = panel_obj.get('Name') or panel_obj.get('PanelGuid') or panel_obj.get('GUID')
+    key = (id(materials), panel_guid)
+    hit = _filter_cache.get(key)
+    if hit is None or hit[0] is not materials:
+        hit = _filter_cache[key] = (materials, _filter_materials_by_guid(materials, panel_obj))
+    return hit[1]
+
+
 # Top-level panel sort key (numeric trailing segment preferred)
 def _panel_sort_key(panel_name):
     try:
@@ -195,11 +468,20 @@ def _panel_sort_key(panel_name):
     except Exception:
         return (1, str(panel_name))
 
+# bumped whenever format_and_sort_materials fills in a missing Label, which
+# invalidates anything derived from labels (see _panel_detail_materials)
+_label_version = 0
+
+
 def format_and_sort_materials(mats):
+    global _label_version
     # ensure label fallback
     for m in mats:
         if not m.get('Label'):
             m['Label'] = (m.get('Type','') + '-' + (m.get('Desc') or ''))[:6]
+            # the label feeds the rough-opening check; re-evaluate it next time
+            m.pop('_is_ro', None)
+            _label_version += 1
 
     # group identical materials by (Label, Type, Desc, length, width)
     groups = {}
@@ -227,7 +509,8 @@ def format_and_sort_materials(mats):
         wid_str = inches_to_feet_inches_sixteenths(width) if width not in (None, '', '0', '0.0') else ''
         size = ''
         # Sheets include width in the size; boards/bracing use length only
-        if 'sheet' in typ.lower() or 'sheath' in typ.lower():
+        typ_lc = typ.lower()
+        if 'sheet' in typ_lc or 'sheath' in typ_lc:
             if len_str and wid_str:
                 size = f"{len_str} x {wid_str}"
             elif len_str:
@@ -251,14 +534,49 @@ def format_and_sort_materials(mats):
         lines.append(line)
     return lines
 
+# characters not allowed in Windows file names, plus spaces, map to '_'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?* '})
+
+# rough openings whose header reference is known by label
+_RO_HEADER_OVERRIDES = {'BSMT-HDR': ('G',), '49x63-L2': ('F',)}
+
+# Panel specification lines in the exported details: (label, panel key)
+_EXPORT_DETAIL_FIELDS = (
+    ('Category', 'Category'),
+    ('Load Bearing', 'LoadBearing'),
+    ('Wall Length', 'WallLength'),
+    ('Height', 'Height'),
+    ('Thickness', 'Thickness'),
+    ('Stud Spacing', 'StudSpacing'),
+)
+
+
+def _header_labels(materials):
+    """Unique Label of every header material in materials."""
+    return list({m.get('Label', '') for m in materials if _material_type_lc(m) == 'header' and m.get('Label', '')})
+
+
+# labels that mark a rough opening even though they look header-ish
+_RO_LABELS = frozenset(('bsmt-hdr', '49x63-l2'))
+_HEADER_TYPES = frozenset(('headercap', 'headercripple'))
+
+
 def _is_rough_opening(m):
+    """True when m is a rough opening; uses the flag cached at parse time when present."""
+    if not isinstance(m, dict):
+        return False
+    cached = m.get('_is_ro')
+    if cached is not None:
+        return cached
+    return _classify_rough_opening(m)
+
+
+def _classify_rough_opening(m):
     try:
-        if not isinstance(m, dict):
-            return False
-        typ = (m.get('Type') or '').lower()
+        typ = _material_type_lc(m)
         desc = (m.get('Desc') or m.get('Description') or '').lower()
         lbl = (m.get('Label') or '').lower()
-        fam = (m.get('FamilyMemberName') or '').lower()
+        fam = _material_family_lc(m)
 
         # Primary check: exact match for RoughOpening type
         if typ == 'roughopening':
@@ -271,9 +589,9 @@ def _is_rough_opening(m):
             return True
 
         # Specific rough opening labels (but not header-related ones)
-        if lbl in ['bsmt-hdr', '49x63-l2'] or 'hdr' in lbl:
+        if lbl in _RO_LABELS or 'hdr' in lbl:
             # Make sure it's not a header material
-            if 'header' not in typ and typ != 'headercap' and typ != 'headercripple':
+            if 'header' not in typ and typ not in _HEADER_TYPES:
                 return True
 
         return False
@@ -411,444 +729,245 @@ def get_aff_for_rough_opening(panel_obj, m, size_tol=1.0):
         pass
     return None
 
+
+# AFF per rough-opening material, keyed by id(m) with the material and panel
+# kept alongside for an identity check. Cleared together with _filter_cache.
+_aff_cache = {}
+
+
+def _aff_for_rough_opening_cached(panel_obj, m):
+    hit = _aff_cache.get(id(m))
+    if hit is None or hit[0] is not m or hit[1] is not panel_obj:
+        hit = _aff_cache[id(m)] = (m, panel_obj, get_aff_for_rough_opening(panel_obj, m))
+    return hit[2]
+
+
+def _iter_ehx_elements(path):
+    """Yield (tag, element) for each Level and Panel as its end tag is parsed.
+
+    Namespace prefixes are stripped from the yielded element's subtree so the
+    usual local-name .find() calls work on it.
+    """
+    if _lxml_etree is not None:
+        for _, el in _lxml_etree.iterparse(path, events=('end',), tag=('{*}Level', '{*}Panel')):
+            for sub in el.iter():
+                try:
+                    if isinstance(sub.tag, str) and '}' in sub.tag:
+                        sub.tag = sub.tag.split('}', 1)[1]
+                except Exception:
+                    pass
+            yield el.tag, el
+        return
+    # stdlib iterparse can't filter by tag; children end before their parent,
+    # so stripping each element as it ends leaves the whole subtree clean
+    for _, el in ET.iterparse(path, events=('end',)):
+        tag = el.tag
+        if isinstance(tag, str) and '}' in tag:
+            tag = el.tag = tag.split('}', 1)[1]
+        if tag in ('Level', 'Panel'):
+            yield tag, el
+
+
+def _attach_level_description(panel_obj, level_guid, level_map, level_guid_map):
+    """Copy the matching Level Description onto panel_obj; True when found."""
+    if level_guid:
+        # prefer LevelGuid if present on the panel
+        lgv = level_guid.strip()
+        if lgv and level_guid_map.get(lgv):
+            panel_obj['LevelDescription'] = level_guid_map.get(lgv)
+            panel_obj.setdefault('Description', level_guid_map.get(lgv))
+            return True
+    else:
+        ln = panel_obj.get('LevelNo') or panel_obj.get('Level')
+        if ln and level_map.get(ln):
+            panel_obj['LevelDescription'] = level_map.get(ln)
+            panel_obj.setdefault('Description', level_map.get(ln))
+            return True
+    return False
+
+
 def parse_panels(path):
     panels = []
     materials_map = {}
     try:
+        # Diagnostic: record attempt to parse and file info
+        exists = os.path.exists(path)
+        size = None
         try:
-            # Diagnostic: record attempt to parse and file info
-            exists = os.path.exists(path)
-            size = None
-            try:
-                if exists:
-                    size = os.path.getsize(path)
-            except Exception:
-                size = None
-            log_debug(f"parse_panels called path={path} exists={exists} size={size}")
-        except Exception:
-            pass
-        tree = ET.parse(path)
-        root = tree.getroot()
-        try:
-            # Remove namespace prefixes from tags so subsequent .find/.findall
-            # calls that use local tag names work regardless of XML namespaces.
-            for el in list(root.iter()):
-                try:
-                    if isinstance(el.tag, str) and '}' in el.tag:
-                        el.tag = el.tag.split('}', 1)[1]
-                except Exception:
-                    pass
-        except Exception:
-            pass
-    except Exception as e:
-        try:
-            log_debug(f"parse_panels failed to parse {path} exception={e}")
-            # attempt to read small sample for debugging
-            try:
-                with open(path, 'rb') as fh:
-                    sample = fh.read(256)
-                    log_debug(f"parse_panels sample={sample[:200]!r}")
-            except Exception:
-                pass
+            if exists:
+                size = os.path.getsize(path)
         except Exception:
-            pass
-        return panels, materials_map
+            size = None
+        log_debug(f"parse_panels called path={path} exists={exists} size={size}")
+    except Exception:
+        pass
 
     # build maps for Level metadata. We index by LevelNo and by LevelGuid
     # when available so panels can be associated using either field.
     level_map = {}        # maps LevelNo -> Description
     level_guid_map = {}   # maps LevelGuid -> Description
-    for lev in root.findall('.//Level'):
-        ln = None
-        for tag in ('LevelNo', 'LevelID', 'Level'):
-            el = lev.find(tag)
-            if el is not None and el.text:
-                ln = el.text.strip()
-                break
-        lg = None
-        for tag in ('LevelGuid', 'LevelGUID', 'LevelID'):
-            el = lev.find(tag)
-            if el is not None and el.text:
-                lg = el.text.strip()
-                break
-        desc = None
-        d_el = lev.find('Description')
-        if d_el is not None and d_el.text:
-            desc = d_el.text.strip()
-        if ln:
-            level_map.setdefault(ln, desc)
-        if lg:
-            level_guid_map.setdefault(lg, desc)
-
-    # diagnostic: count Panel elements using both namespaced and local-name approaches
-    try:
-        ns_count = 0
-        try:
-            ns_count = len(root.findall('.//{*}Panel'))
-        except Exception:
-            ns_count = 0
-        local_count = len(root.findall('.//Panel'))
-        log_debug(f"panel element counts ns_count={ns_count} local_count={local_count}")
-        if local_count == 0 and ns_count > 0:
-            # try to normalize tags by stripping namespace prefixes (we already attempted this earlier),
-            # but if we still have only namespaced tags attempt the text fallback later.
-            log_debug("parse_panels detected only namespaced Panel elements; continuing but will fallback if none parsed")
-    except Exception:
-        pass
+    # panels whose Level may only appear later in the file: (panel_obj, LevelGuid text)
+    pending_levels = []
+    found = 0
 
-    for panel_el in root.findall('.//Panel'):
-        # Extract both PanelGuid (for internal processing) and Label (for display)
-        panel_guid = None
-        panel_label = None
-
-        # Get PanelGuid first (for internal processing)
-        for t in ('PanelGuid', 'PanelID'):
-            el = panel_el.find(t)
-            if el is not None and el.text:
-                panel_guid = el.text.strip()
-                break
+    # Stream the file so each Panel subtree can be dropped once its data has
+    # been copied out, instead of holding the whole document in memory.
+    try:
+        for tag, panel_el in _iter_ehx_elements(path):
+            if tag == 'Level':
+                lev = panel_el
+                ln = None
+                for t in ('LevelNo', 'LevelID', 'Level'):
+                    el = lev.find(t)
+                    if el is not None and el.text:
+                        ln = el.text.strip()
+                        break
+                lg = None
+                for t in ('LevelGuid', 'LevelGUID', 'LevelID'):
+                    el = lev.find(t)
+                    if el is not None and el.text:
+                        lg = el.text.strip()
+                        break
+                desc = None
+                d_el = lev.find('Description')
+                if d_el is not None and d_el.text:
+                    desc = d_el.text.strip()
+                if ln:
+                    level_map.setdefault(ln, desc)
+                if lg:
+                    level_guid_map.setdefault(lg, desc)
+                continue
 
-        # Get Label for display purposes
-        label_el = panel_el.find('Label')
-        if label_el is not None and label_el.text:
-            panel_label = label_el.text.strip()
+            found += 1
+            # Extract both PanelGuid (for internal processing) and Label (for display)
+            panel_guid = None
+            panel_label = None
 
-        # Fallback for panel_guid if not found
-        if not panel_guid:
-            for t in ('PanelName', 'PanelID', 'Label'):
+            # Get PanelGuid first (for internal processing)
+            for t in ('PanelGuid', 'PanelID'):
                 el = panel_el.find(t)
                 if el is not None and el.text:
                     panel_guid = el.text.strip()
                     break
 
-        if not panel_guid:
-            panel_guid = f"Panel_{len(panels)+1}"
-
-        # Use panel_guid as the fallback for panel_label if Label is not available
-        if not panel_label:
-            panel_label = panel_guid
-
-        panel_obj = {'Name': panel_guid, 'DisplayLabel': panel_label}
-        # attach LevelGuid to panel_obj if present so callers can access it
-        lg_el = panel_el.find('LevelGuid')
-        if lg_el is not None and lg_el.text:
-            panel_obj['LevelGuid'] = lg_el.text.strip()
-        # try to capture LevelNo if present on the Panel
-        lvl = panel_el.find('LevelNo')
-        if lvl is not None and lvl.text:
-            panel_obj['LevelNo'] = lvl.text.strip()
-            # also set 'Level' for backward compatibility/display
-            panel_obj['Level'] = panel_obj['LevelNo']
-        for fld in ('Level','Description','Bundle','BundleName','BundleGuid','Height','Thickness','StudSpacing','WallLength','LoadBearing','Category','OnScreenInstruction','Weight'):
-            el = panel_el.find(fld)
-            if el is not None and el.text:
-                panel_obj[fld] = el.text.strip()
-
-        # if panel lacks a Description but a LevelDescription exists in the level_map or level_guid_map, attach it
-        try:
-            if not panel_obj.get('Description'):
-                # prefer LevelGuid if present on the panel
-                lg = panel_el.find('LevelGuid')
-                if lg is not None and lg.text:
-                    lgv = lg.text.strip()
-                    if lgv and lgv in level_guid_map and level_guid_map.get(lgv):
-                        panel_obj['LevelDescription'] = level_guid_map.get(lgv)
-                        panel_obj.setdefault('Description', level_guid_map.get(lgv))
-                else:
-                    ln = panel_obj.get('LevelNo') or panel_obj.get('Level')
-                    if ln and ln in level_map and level_map.get(ln):
-                        panel_obj['LevelDescription'] = level_map.get(ln)
-                        panel_obj.setdefault('Description', level_map.get(ln))
-        except Exception:
-            pass
-
-        # Extract elevation information for this panel
-        panel_obj['elevations'] = extract_elevation_info(panel_el)
-
-        # Debug: Log elevation information
-        elevations = panel_obj.get('elevations', [])
-        if elevations:
-            log_debug(f"Panel {panel_guid} has {len(elevations)} elevation views")
-            for i, elev in enumerate(elevations):
-                log_debug(f"Elevation {i}: min_y={elev.get('min_y')}, max_y={elev.get('max_y')}, height={elev.get('height')}, points={len(elev.get('points', []))}")
-        else:
-            log_debug(f"Panel {panel_guid} has no elevation data")
-
-        panels.append(panel_obj)
-
-        # parse materials for this panel and annotate each material with
-        # the panel-level GUIDs (PanelGuid, BundleGuid, LevelGuid) so
-        # downstream consumers can perform GUID-first filtering.
-        mats = parse_materials_from_panel(panel_el)
-        if mats:
-            # capture bundle guid if present on panel
-            bg_el = panel_el.find('BundleGuid')
-            bundle_guid = bg_el.text.strip() if (bg_el is not None and bg_el.text) else None
-            level_guid = panel_obj.get('LevelGuid')
-            for m in mats:
-                try:
-                    if isinstance(m, dict):
-                        # don't overwrite if the material already has a PanelGuid
-                        m.setdefault('PanelGuid', panel_guid)
-                        if bundle_guid:
-                            m.setdefault('BundleGuid', bundle_guid)
-                        if level_guid:
-                            m.setdefault('LevelGuid', level_guid)
-                except Exception:
-                    pass
-            materials_map[panel_guid] = mats
-
-    try:
-        found = len(root.findall('.//Panel')) if root is not None else 0
-        log_debug(f"parse_panels returning panels_count={len(panels)} found_in_xml={found}")
-        # show up to 6 display labels for diagnostics
-        try:
-            sample_labels = [p.get('DisplayLabel') for p in panels[:6]]
-            log_debug(f"parse_panels sample_labels={sample_labels}")
-        except Exception:
-            pass
-    except Exception:
-        pass
-    return panels, materials_map
-
-    def extract_jobpath(path):
-        try:
-            tree = ET.parse(path)
-            root = tree.getroot()
-            el = root.find('.//JobPath')
-            if el is not None and el.text:
-                return el.text.strip()
-        except Exception:
-            pass
-        return ''
+            # Get Label for display purposes
+            label_el = panel_el.find('Label')
+            if label_el is not None and label_el.text:
+                panel_label = label_el.text.strip()
+
+            # Fallback for panel_guid if not found
+            if not panel_guid:
+                for t in ('PanelName', 'PanelID', 'Label'):
+                    el = panel_el.find(t)
+                    if el is not None and el.text:
+                        panel_guid = el.text.strip()
+                        break
 
-    def write_expected_and_materials_logs(ehx_path, panels_by_name, materials_map):
-        """Write expected.log and materials.log into the same directory as the EHX file.
-        Format is matched to the provided examples as closely as possible.
-        """
-        import time
-        folder = os.path.dirname(ehx_path)
-        fname = os.path.basename(ehx_path)
-        # use timezone-aware UTC datetime to avoid DeprecationWarning
-        ts = _dt.datetime.now(_dt.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            if not panel_guid:
+                panel_guid = f"Panel_{len(panels)+1}"
+
+            # Use panel_guid as the fallback for panel_label if Label is not available
+            if not panel_label:
+                panel_label = panel_guid
+
+            panel_obj = {'Name': panel_guid, 'DisplayLabel': panel_label}
+            # attach LevelGuid to panel_obj if present so callers can access it
+            lg_el = panel_el.find('LevelGuid')
+            if lg_el is not None and lg_el.text:
+                panel_obj['LevelGuid'] = lg_el.text.strip()
+            # try to capture LevelNo if present on the Panel
+            lvl = panel_el.find('LevelNo')
+            if lvl is not None and lvl.text:
+                panel_obj['LevelNo'] = lvl.text.strip()
+                # also set 'Level' for backward compatibility/display
+                panel_obj['Level'] = panel_obj['LevelNo']
+            for fld in ('Level','Description','Bundle','BundleName','BundleGuid','Height','Thickness','StudSpacing','WallLength','LoadBearing','Category','OnScreenInstruction','Weight'):
+                el = panel_el.find(fld)
+                if el is not None and el.text:
+                    panel_obj[fld] = el.text.strip()
 
-        expected_path = os.path.join(folder, 'expected.log')
-        materials_path = os.path.join(folder, 'materials.log')
+            # if panel lacks a Description but a LevelDescription exists in the level_map or level_guid_map, attach it.
+            # Levels listed after this panel aren't known yet; retry those once the file is done.
+            try:
+                if not panel_obj.get('Description'):
+                    lg_text = lg_el.text if lg_el is not None else None
+                    if not _attach_level_description(panel_obj, lg_text, level_map, level_guid_map):
+                        pending_levels.append((panel_obj, lg_text))
+            except Exception:
+                pass
 
-        # expected.log
-        try:
-            with open(expected_path, 'w', encoding='utf-8') as fh:
-                fh.write(f"=== expected.log cleared at {ts} for {fname} ===\n")
-                for pname, pobj in panels_by_name.items():
-                    # Use DisplayLabel for log output, fallback to internal name
-                    display_name = pobj.get('DisplayLabel', pname)
-                    fh.write(f"Panel: {display_name}\n")
-                    if 'Level' in pobj:
-                        fh.write(f"Level: {pobj.get('Level')}\n")
-                    if 'Description' in pobj:
-                        fh.write(f"Description: {pobj.get('Description')}\n")
-                    # bundle
-                    b = pobj.get('Bundle') or pobj.get('BundleName') or ''
-                    if b:
-                        fh.write(f"Bundle: {b}\n")
-                    fh.write("Panel Details:\n")
-                    # bullets with friendly labels and the requested ordering
-                    display_map = {
-                        'Category': 'Category',
-                        'LoadBearing': 'Load Bearing',
-                        'WallLength': 'Wall Length',
-                        'Height': 'Height',
-                        'Thickness': 'Thickness',
-                        'StudSpacing': 'Stud Spacing',
-                    }
-                    for key in ('Category','LoadBearing','WallLength','Height','Thickness','StudSpacing'):
-                        if key in pobj:
-                            fh.write(f"• {display_map.get(key,key)}: {pobj.get(key)}\n")
-
-                    # also print Level {LevelNo}: {Description} inside Panel Details if available
-                    try:
-                        level_no = pobj.get('LevelNo') or pobj.get('Level')
-                        desc_txt = pobj.get('Description') or ''
-                        if level_no and desc_txt:
-                            fh.write(f"• Level {level_no}: {desc_txt}\n")
-                    except Exception:
-                        pass
+            # Extract elevation information for this panel
+            panel_obj['elevations'] = extract_elevation_info(panel_el)
 
-                    # detect sheathing layers from materials and print them next
+            # Debug: Log elevation information
+            elevations = panel_obj.get('elevations', [])
+            if elevations:
+                log_debug(f"Panel {panel_guid} has {len(elevations)} elevation views")
+                for i, elev in enumerate(elevations):
+                    log_debug(f"Elevation {i}: min_y={elev.get('min_y')}, max_y={elev.get('max_y')}, height={elev.get('height')}, points={len(elev.get('points', []))}")
+            else:
+                log_debug(f"Panel {panel_guid} has no elevation data")
+
+            panels.append(panel_obj)
+
+            # parse materials for this panel and annotate each material with
+            # the panel-level GUIDs (PanelGuid, BundleGuid, LevelGuid) so
+            # downstream consumers can perform GUID-first filtering.
+            mats = parse_materials_from_panel(panel_el)
+            if mats:
+                # capture bundle guid if present on panel
+                bg_el = panel_el.find('BundleGuid')
+                bundle_guid = bg_el.text.strip() if (bg_el is not None and bg_el.text) else None
+                level_guid = panel_obj.get('LevelGuid')
+                for m in mats:
                     try:
-                        sheet_descs = []
-                        for m in materials_map.get(pname, []):
-                            try:
-                                if isinstance(m, dict):
-                                    t = (m.get('Type') or '').lower()
-                                    if 'sheet' in t or 'sheath' in t or (m.get('FamilyMemberName') and 'sheath' in str(m.get('FamilyMemberName')).lower()):
-                                        # prefer the explicit <Description> element for sheathing text
-                                        d = (m.get('Description') or m.get('Desc') or '').strip()
-                                        if d and d not in sheet_descs:
-                                            sheet_descs.append(d)
-                            except Exception:
-                                pass
-                        if len(sheet_descs) > 0:
-                            fh.write(f"• Sheathing Layer 1: {sheet_descs[0]}\n")
-                        if len(sheet_descs) > 1:
-                            fh.write(f"• Sheathing Layer 2: {sheet_descs[1]}\n")
+                        if isinstance(m, dict):
+                            # don't overwrite if the material already has a PanelGuid
+                            m.setdefault('PanelGuid', panel_guid)
+                            if bundle_guid:
+                                m.setdefault('BundleGuid', bundle_guid)
+                            if level_guid:
+                                m.setdefault('LevelGuid', level_guid)
                     except Exception:
                         pass
+                materials_map[panel_guid] = mats
 
-                    if 'Weight' in pobj:
-                        fh.write(f"• Weight: {pobj.get('Weight')}\n")
-                    if 'OnScreenInstruction' in pobj:
-                        fh.write(f"• Production Notes: {pobj.get('OnScreenInstruction')}\n")
-                    # list rough openings (if any) under Panel Details after Production Notes — no colon after label
-                    try:
-                        for m in materials_map.get(pname, []):
-                            try:
-                                if _is_rough_opening(m):
-                                    lab = m.get('Label') or ''
-                                    desc = m.get('Desc') or m.get('Description') or ''
-                                    ln = m.get('ActualLength') or m.get('Length') or ''
-                                    wd = m.get('ActualWidth') or m.get('Width') or ''
-
-                                    # Compute AFF using geometry-aware helper (prefers material AFF/elev then geometry matches)
-                                    aff_height = get_aff_for_rough_opening(pobj, m)
-
-                                    # Find associated headers based on rough opening type
-                                    associated_headers = []
-                                    # Prefer material-level ReferenceHeader if provided
-                                    try:
-                                        if isinstance(m, dict) and m.get('ReferenceHeader'):
-                                            associated_headers = [str(m.get('ReferenceHeader'))]
-                                    except Exception:
-                                        associated_headers = []
-
-                                    if not associated_headers:
-                                        if lab == 'BSMT-HDR':
-                                            # BSMT-HDR uses G headers
-                                            associated_headers = ['G']
-                                        elif lab == '49x63-L2':
-                                            # 49x63-L2 uses F headers
-                                            associated_headers = ['F']
-                                        else:
-                                            # Fallback: find unique header labels (only header-type materials)
-                                            header_set = set()
-                                            for mat in materials_map.get(pname, []):
-                                                if mat.get('Type', '').lower() == 'header':
-                                                    header_label = mat.get('Label', '')
-                                                    if header_label:
-                                                        header_set.add(header_label)
-                                            associated_headers = list(header_set)
-
-                                    # Format the rough opening display
-                                    ro_text = f"Rough Opening: {lab}"
-                                    if ln and wd:
-                                        ro_text += f" - {ln} x {wd}"
-                                    elif ln:
-                                        ro_text += f" - {ln}"
-                                    if aff_height is not None:
-                                        formatted_aff = inches_to_feet_inches_sixteenths(str(aff_height))
-                                        if formatted_aff:
-                                            ro_text += f" (AFF: {aff_height} ({formatted_aff}))"
-                                        else:
-                                            ro_text += f" (AFF: {aff_height})"
-                                    if associated_headers:
-                                        ro_text += f" [Headers: {', '.join(associated_headers)}]"
-
-                                    fh.write(f"• {ro_text}\n")
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-                    fh.write('\n')
-                    fh.write("Panel Material Breakdown:\n")
-                    lines = []
-                    mats = materials_map.get(pname, [])
-                    # filter out rough openings from the breakdown
-                    mats_filtered = [m for m in (mats or []) if not _is_rough_opening(m)]
-                    lines = format_and_sort_materials(mats_filtered)
-                    for l in lines:
-                        fh.write(f"{l}\n")
-                    fh.write('---\n')
+            # everything we need is copied out; drop the subtree. Earlier
+            # siblings are left alone since a Panel may sit inside a Level
+            # whose own fields haven't been read yet.
+            panel_el.clear()
+    except Exception as e:
+        try:
+            log_debug(f"parse_panels failed to parse {path} exception={e}")
+            # attempt to read small sample for debugging
+            try:
+                with open(path, 'rb') as fh:
+                    sample = fh.read(256)
+                    log_debug(f"parse_panels sample={sample[:200]!r}")
+            except Exception:
+                pass
         except Exception:
             pass
+        return [], {}
 
-        # materials.log (Type: ... lines)
+    for panel_obj, lg_text in pending_levels:
         try:
-            with open(materials_path, 'w', encoding='utf-8') as fh:
-                fh.write(f"=== materials.log cleared at {ts} for {fname} ===\n")
-                for pname, pobj in panels_by_name.items():
-                    # Use DisplayLabel for log output, fallback to internal name
-                    display_name = pobj.get('DisplayLabel', pname)
-                    fh.write(f"Panel: {display_name}\n")
-                    if 'Level' in pobj:
-                        fh.write(f"Level: {pobj.get('Level')}\n")
-                    if 'Description' in pobj:
-                        fh.write(f"Description: {pobj.get('Description')}\n")
-                    b = pobj.get('Bundle') or pobj.get('BundleName') or ''
-                    if b:
-                        fh.write(f"Bundle: {b}\n")
-                    for m in materials_map.get(pname, []):
-                        try:
-                            fh.write(f"Type: {m.get('FamilyMemberName','')} , Label: {m.get('Label','')} , SubAssembly: {m.get('SubAssembly','')} , Desc: {m.get('Desc','')}\n")
-                        except Exception:
-                            pass
-                    fh.write('---\n')
+            _attach_level_description(panel_obj, lg_text, level_map, level_guid_map)
         except Exception:
             pass
 
-    def extract_jobpath(path):
-        """Return JobPath text from the EHX if present, else empty string."""
-        import xml.etree.ElementTree as ET
+    try:
+        log_debug(f"parse_panels returning panels_count={len(panels)} found_in_xml={found}")
+        # show up to 6 display labels for diagnostics
         try:
-            tree = ET.parse(path)
-            root = tree.getroot()
-            el = root.find('.//JobPath')
-            if el is not None and el.text:
-                return el.text.strip()
+            sample_labels = [p.get('DisplayLabel') for p in panels[:6]]
+            log_debug(f"parse_panels sample_labels={sample_labels}")
         except Exception:
             pass
-        return ''
+    except Exception:
+        pass
+    return panels, materials_map
 
-    def _filter_materials_by_guid(materials, panel_obj):
-        """Return materials filtered by PanelGuid (preferred), then LevelGuid, then BundleGuid.
-        If no GUIDs available, fall back to returning the original list.
-        """
-        try:
-            if not isinstance(materials, (list, tuple)):
-                return materials or []
-            pg = panel_obj.get('Name') or panel_obj.get('PanelGuid')
-            lg = panel_obj.get('LevelGuid')
-            bg = panel_obj.get('BundleGuid') or panel_obj.get('BundleId')
-            out = []
-            for m in materials:
-                if not isinstance(m, dict):
-                    continue
-                m_pg = m.get('PanelGuid')
-                m_lg = m.get('LevelGuid')
-                m_bg = m.get('BundleGuid')
-                # PanelGuid match is highest priority
-                if pg and m_pg:
-                    if str(m_pg) == str(pg):
-                        out.append(m)
-                    else:
-                        continue
-                # Next prefer LevelGuid
-                elif lg and m_lg:
-                    if str(m_lg) == str(lg):
-                        out.append(m)
-                    else:
-                        continue
-                # Next try BundleGuid
-                elif bg and m_bg:
-                    if str(m_bg) == str(bg):
-                        out.append(m)
-                    else:
-                        continue
-                else:
-                    # no GUID info to filter by; include as fallback
-                    out.append(m)
-            return out
-        except Exception:
-            return materials or []
 
 # Theme colors and defaults
 TOP_BG = '#cfeffd'
@@ -911,21 +1030,16 @@ def write_expected_and_materials_logs(ehx_path, panels_by_name, materials_map):
                         roughs = [m for m in (mats or []) if _is_rough_opening(m)]
                         if roughs:
                             fh.write("Rough Openings:\n")
+                            # _is_rough_opening() only accepts dicts, so no per-item guard is needed
                             for m in roughs:
+                                aff = None
                                 try:
-                                    aff = None
-                                    try:
-                                        aff = get_aff_for_rough_opening(pobj or {}, m)
-                                    except Exception:
-                                        aff = m.get('AFF') if isinstance(m, dict) else None
-                                    aff_s = f"{float(aff):.3f}" if isinstance(aff, (int, float)) else (str(aff) if aff is not None else 'None')
-                                    lbl = m.get('Label') or m.get('Desc') or ''
-                                    fh.write(f"  - {lbl} AFF={aff_s}\n")
+                                    aff = get_aff_for_rough_opening(pobj or {}, m)
                                 except Exception:
-                                    try:
-                                        fh.write(f"  - {str(m)}\n")
-                                    except Exception:
-                                        pass
+                                    aff = m.get('AFF')
+                                aff_s = f"{float(aff):.3f}" if isinstance(aff, (int, float)) else (str(aff) if aff is not None else 'None')
+                                lbl = m.get('Label') or m.get('Desc') or ''
+                                fh.write(f"  - {lbl} AFF={aff_s}\n")
                     except Exception:
                         pass
         except Exception as e:
@@ -943,22 +1057,19 @@ def write_expected_and_materials_logs(ehx_path, panels_by_name, materials_map):
                         # print per-material lines; include AFF for rough openings when available
                         try:
                             for m in (mats or []):
-                                try:
-                                    if _is_rough_opening(m):
-                                        aff = None
-                                        try:
-                                            aff = get_aff_for_rough_opening(panels_by_name.get(pname, {}), m)
-                                        except Exception:
-                                            aff = m.get('AFF') if isinstance(m, dict) else None
-                                        aff_s = f"{float(aff):.3f}" if isinstance(aff, (int, float)) else (str(aff) if aff is not None else '')
-                                        fh.write(f"Type: {m.get('Type')} Label: {m.get('Label')} AFF={aff_s}\n")
-                                    else:
-                                        fh.write(f"Type: {m.get('Type')} Label: {m.get('Label')}\n")
-                                except Exception:
+                                if not isinstance(m, dict):
+                                    fh.write(str(m) + '\n')
+                                    continue
+                                if _is_rough_opening(m):
+                                    aff = None
                                     try:
-                                        fh.write(str(m) + '\n')
+                                        aff = get_aff_for_rough_opening(panels_by_name.get(pname, {}), m)
                                     except Exception:
-                                        pass
+                                        aff = m.get('AFF')
+                                    aff_s = f"{float(aff):.3f}" if isinstance(aff, (int, float)) else (str(aff) if aff is not None else '')
+                                    fh.write(f"Type: {m.get('Type')} Label: {m.get('Label')} AFF={aff_s}\n")
+                                else:
+                                    fh.write(f"Type: {m.get('Type')} Label: {m.get('Label')}\n")
                         except Exception:
                             pass
         except Exception as e:
@@ -977,6 +1088,13 @@ def write_expected_and_materials_logs(ehx_path, panels_by_name, materials_map):
             pass
 
 
+def _local_tag(tag):
+    """Return the tag name without any '{namespace}' prefix."""
+    if isinstance(tag, str):
+        return tag.rsplit('}', 1)[-1]
+    return tag
+
+
 def parse_panels_minimal(path):
     """Very small parser that returns a list of panels with Name and DisplayLabel
     used as a fallback to ensure the GUI can show buttons while the full parser
@@ -987,32 +1105,34 @@ def parse_panels_minimal(path):
     try:
         tree = ET.parse(path)
         root = tree.getroot()
-        # strip namespaces locally
-        try:
-            for el in list(root.iter()):
-                try:
-                    if isinstance(el.tag, str) and '}' in el.tag:
-                        el.tag = el.tag.split('}', 1)[1]
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        for panel_el in root.findall('.//Panel'):
+        # compare local tag names instead of rewriting every tag in the tree
+        for panel_el in root.iter():
+            if panel_el is root or _local_tag(panel_el.tag) != 'Panel':
+                continue
             try:
+                # single pass over the direct children instead of one find() per field
                 pg = None
                 pl = None
-                el = panel_el.find('PanelGuid')
-                if el is not None and el.text:
-                    pg = el.text.strip()
-                el = panel_el.find('Label')
-                if el is not None and el.text:
-                    pl = el.text.strip()
+                alt_id = None
+                alt_name = None
+                for ch in panel_el:
+                    if not ch.text:
+                        continue
+                    tag = _local_tag(ch.tag)
+                    if tag == 'PanelGuid':
+                        if pg is None:
+                            pg = ch.text.strip()
+                    elif tag == 'Label':
+                        if pl is None:
+                            pl = ch.text.strip()
+                    elif tag == 'PanelID':
+                        if alt_id is None:
+                            alt_id = ch.text.strip()
+                    elif tag == 'PanelName':
+                        if alt_name is None:
+                            alt_name = ch.text.strip()
                 if not pg:
-                    for tag in ('PanelID','PanelName'):
-                        el = panel_el.find(tag)
-                        if el is not None and el.text:
-                            pg = el.text.strip()
-                            break
+                    pg = alt_id or alt_name
                 if not pg:
                     pg = f"Panel_{len(out_panels)+1}"
                 if not pl:
@@ -1076,15 +1196,192 @@ def parse_panels_text_fallback(path):
             pass
     return out_panels, {}
 
-# DEFAULT_STATE explained:
-# - left_w: width (px) of the left/white zone (file list area).
-# - details_w: width (px) of the yellow details zone (content area with labels).
-# - breakdown_w: width (px) of the pink breakdown zone (material breakdown area).
-# - green_h: height (px) of the green bundle/buttons area (vertical height of the top green region).
-#
-# To change a zone size later: update the corresponding value here, then either
-# restart the GUI or press the 'Reset View' button which applies DEFAULT_STATE
-# values (reset_view() uses these constants). The GUI also saves/restores
+
+def _parse_ehx(full, pv_mod=None):
+    """(panels, materials_map) for an EHX file: PV0825's parser when given,
+    else parse_panels with parse_panels_minimal as fallback. Touches no Tk
+    state so it can run on _parse_pool."""
+    if pv_mod and hasattr(pv_mod, 'parse_panels'):
+        try:
+            return pv_mod.parse_panels(full) or ([], {})
+        except Exception:
+            return [], {}
+    try:
+        try:
+            log_debug(f"process_selected_ehx about to call parse_panels for {full}")
+        except Exception:
+            pass
+        panels, materials_map = parse_panels(full) or ([], {})
+        try:
+            if not panels:
+                log_debug(f"parse_panels returned empty, falling back to parse_panels_minimal for {full}")
+                panels, materials_map = parse_panels_minimal(full) or ([], {})
+                log_debug(f"parse_panels_minimal returned count={len(panels)}")
+        except Exception:
+            pass
+        try:
+            # Diagnostic: log what parse_panels returned
+            ptype = type(panels).__name__
+            pcount = len(panels) if hasattr(panels, '__len__') else 0
+            try:
+                sample = panels[:6] if isinstance(panels, (list, tuple)) else list(panels.keys())[:6]
+            except Exception:
+                sample = None
+            log_debug(f"parse result type={ptype} count={pcount} sample={sample}")
+        except Exception:
+            pass
+    except Exception:
+        panels, materials_map = [], {}
+    return panels, materials_map
+
+
+# Look for a PV0825.py near the EHX (or this script) and parse with it for
+# exact parity. Disabled while testing the local parser.
+USE_PV0825 = False
+# folder -> loaded PV0825 module (or None), so each folder is searched once
+_pv_mod_cache = {}
+
+
+def _find_pv0825(folder):
+    if folder in _pv_mod_cache:
+        return _pv_mod_cache[folder]
+    pv_mod = None
+    try:
+        candidates = [
+            os.path.join(folder, 'PV0825.py'),
+            os.path.join(folder, 'Expected', 'PV0825.py'),
+            os.path.join(folder, 'Working', 'PV0825.py'),
+            os.path.join(folder, 'Working', 'Expected', 'PV0825.py'),
+            os.path.join(HERE, 'PV0825.py'),
+            os.path.join(HERE, 'Working', 'PV0825.py'),
+            os.path.join(HERE, 'Working', 'Expected', 'PV0825.py'),
+        ]
+        for c in candidates:
+            try:
+                if c and os.path.exists(c):
+                    spec = importlib.util.spec_from_file_location('PV0825_local', c)
+                    mod = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(mod)
+                    pv_mod = mod
+                    break
+            except Exception:
+                pv_mod = None
+    except Exception:
+        pv_mod = None
+    _pv_mod_cache[folder] = pv_mod
+    return pv_mod
+
+
+# EHX files are parsed off the Tk thread, one at a time
+_parse_pool = ThreadPoolExecutor(max_workers=1)
+# how often (ms) the GUI checks whether a background parse has finished
+PARSE_POLL_MS = 25
+# parsed EHX results by (path, mtime_ns, size), oldest dropped past _PARSE_CACHE_MAX
+_parse_cache = {}
+_PARSE_CACHE_MAX = 8
+
+
+def _copy_parsed(panels, materials_map):
+    """Copy a parse result down to the panel/material dicts. The GUI adds
+    cache keys to panels and fills Labels/pops _is_ro on materials in place,
+    so the cache keeps a pristine copy and hands out fresh ones."""
+    if isinstance(panels, dict):
+        panels = {k: dict(v) if isinstance(v, dict) else v for k, v in panels.items()}
+    else:
+        panels = [dict(p) if isinstance(p, dict) else p for p in (panels or [])]
+    if isinstance(materials_map, dict):
+        materials_map = {k: [dict(m) if isinstance(m, dict) else m for m in (v or [])]
+                         for k, v in materials_map.items()}
+    return panels, materials_map
+
+
+def _parse_cache_key(full):
+    try:
+        st = os.stat(full)
+        return (full, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _write_ehx_logs(writer, full, panels_by_name, materials_map):
+    """Run the expected/materials log writer for an EHX, falling back to
+    minimal cleared logs if it fails. Runs on _parse_pool."""
+    try:
+        writer(full, panels_by_name, materials_map)
+        try:
+            log_debug(f"writer completed for {full}")
+        except Exception:
+            pass
+    except Exception as we:
+        try:
+            log_debug(f"writer failed for {full} exception={we}")
+        except Exception:
+            pass
+        # last-resort: attempt best-effort write using local helpers
+        try:
+            ts = _dt.datetime.now(_dt.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            folder = os.path.dirname(full)
+            fname = os.path.basename(full)
+            with open(os.path.join(folder, 'expected.log'), 'w', encoding='utf-8') as _fh:
+                _fh.write(f"=== expected.log cleared at {ts} for {fname} ===\n")
+            with open(os.path.join(folder, 'materials.log'), 'w', encoding='utf-8') as _fh:
+                _fh.write(f"=== materials.log cleared at {ts} for {fname} ===\n")
+            try:
+                log_debug(f"fallback writer created minimal logs for {full}")
+            except Exception:
+                pass
+        except Exception as fe:
+            try:
+                log_debug(f"fallback writer failed for {full} exception={fe}")
+            except Exception:
+                pass
+
+
+def _remove_ehx_logs(folder):
+    """Delete expected.log/materials.log from folder. Runs on _parse_pool so it
+    lands after any writer still queued for the previous file."""
+    for nm in ('expected.log', 'materials.log'):
+        # a missing log is fine; anything else is ignored as before
+        try:
+            os.remove(os.path.join(folder, nm))
+        except OSError:
+            pass
+
+
+def _persist_lock_state(state):
+    """Write the locked layout to STATE_FILE and log the lock action.
+
+    Runs on _parse_pool so the Lock action does no file I/O on the Tk thread.
+    """
+    try:
+        with open(STATE_FILE, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(state, indent=2))
+    except Exception:
+        pass
+    try:
+        with open(LOG_FILE, 'a', encoding='utf-8') as fh:
+            fh.write(json.dumps({'ts': _dt.datetime.now(_dt.timezone.utc).isoformat(), 'action': 'lock', 'state': state}) + '\n')
+    except Exception:
+        pass
+
+
+def _clear_state_file():
+    try:
+        if os.path.exists(STATE_FILE):
+            os.remove(STATE_FILE)
+    except Exception:
+        pass
+
+
+# DEFAULT_STATE explained:
+# - left_w: width (px) of the left/white zone (file list area).
+# - details_w: width (px) of the yellow details zone (content area with labels).
+# - breakdown_w: width (px) of the pink breakdown zone (material breakdown area).
+# - green_h: height (px) of the green bundle/buttons area (vertical height of the top green region).
+#
+# To change a zone size later: update the corresponding value here, then either
+# restart the GUI or press the 'Reset View' button which applies DEFAULT_STATE
+# values (reset_view() uses these constants). The GUI also saves/restores
 # a persisted state in `gui_zones_state.json` when toggling lock view.
 #
 DEFAULT_STATE = {
@@ -1104,6 +1401,9 @@ SHOW_PLACEHOLDERS = True
 # Debug: draw computed inner/control bounds inside each bundle for visual verification
 # Disabled by default to avoid obscuring interactive widgets; set True to enable overlay
 SHOW_DEBUG_BOUNDS = False
+# Debug: per-material / per-button trace logging from display_panel and
+# rebuild_bundles. Off by default so redraws don't format and write log lines.
+DEBUG = False
 # Reserve pixels for per-bundle page control area (Prev/Next). This space is
 # subtracted from the inner grid so the 4x4 cells fit symmetrically and aren't
 # clipped by the controls.
@@ -1203,43 +1503,6 @@ def make_gui():
     # track which panel is currently displayed
     selected_panel = {'name': None}
 
-    # Helper: filter materials to those that belong to a given panel using GUID-first logic
-    def _filter_materials_by_guid(materials, panel_obj):
-        try:
-            if not isinstance(materials, (list, tuple)):
-                return materials
-            out = []
-            # Prefer explicit GUIDs available on the panel object
-            panel_guid = None
-            if isinstance(panel_obj, dict):
-                panel_guid = panel_obj.get('Name') or panel_obj.get('PanelGuid') or panel_obj.get('GUID')
-
-            for m in materials:
-                try:
-                    if not isinstance(m, dict):
-                        out.append(m)
-                        continue
-                    # common material keys that may reference a parent panel
-                    mg = m.get('PanelGuid') or m.get('PanelId') or m.get('ParentGuid') or m.get('ParentId') or m.get('Panel')
-                    if panel_guid and mg and str(mg) == str(panel_guid):
-                        out.append(m)
-                        continue
-                    # some materials carry a list of panels they belong to
-                    panels_field = m.get('Panels') or m.get('PanelGuids')
-                    if isinstance(panels_field, (list, tuple)) and panel_guid in panels_field:
-                        out.append(m)
-                        continue
-                    # fallback: if no GUIDs present, accept the material (caller may filter further)
-                    out.append(m)
-                except Exception:
-                    out.append(m)
-            return out
-        except Exception:
-            try:
-                return list(materials)
-            except Exception:
-                return materials
-
     # Helper: produce a sort key for panel names - prefer numeric trailing part when present
     def _panel_sort_key(panel_name):
         try:
@@ -1261,6 +1524,44 @@ def make_gui():
             except Exception:
                 return (1, str(panel_name))
 
+    # sort keys per panel name, computed once per loaded EHX
+    panel_sort_keys = {}
+    # bundle grouping/ordering of current_panels; emptied whenever the panels
+    # change so page navigation only slices what is already sorted
+    bundle_index = {}
+
+    def _bundle_index():
+        if not bundle_index:
+            bundle_panels = {}
+            # collect panels by bundle key (resolved at load time)
+            for name, obj in current_panels.items():
+                if isinstance(obj, dict) and '_bkey' in obj:
+                    bkey, display_label = obj['_bkey'], obj['_bundle_label']
+                else:
+                    bkey, display_label = 'Bundle', None
+                bundle_panels.setdefault(bkey, {'panels': [], 'label': display_label})['panels'].append(name)
+            # Produce a deterministic order for bundle placeholders. Prefer the
+            # captured display label if present; otherwise fall back to the key.
+            def _bundle_label_for_sort(k):
+                info = bundle_panels.get(k, {})
+                lbl = info.get('label') or str(k or '')
+                return _nat_key(lbl)
+            for info in bundle_panels.values():
+                # Sort panels numerically by trailing panel number (e.g. '07_112' -> 112)
+                try:
+                    info['panels'].sort(key=_cached_panel_sort_key)
+                except Exception:
+                    info['panels'].sort()
+            bundle_index['panels'] = bundle_panels
+            bundle_index['ordered'] = sorted(bundle_panels, key=_bundle_label_for_sort)
+        return bundle_index
+
+    def _cached_panel_sort_key(name):
+        key = panel_sort_keys.get(name)
+        if key is None:
+            key = panel_sort_keys[name] = _panel_sort_key(current_panels.get(name, name))
+        return key
+
     # Helper: extract a sensible job path from an EHX file path or parsed XML root
     def extract_jobpath(path_or_root):
         try:
@@ -1268,12 +1569,13 @@ def make_gui():
             # otherwise return the containing folder.
             if isinstance(path_or_root, str):
                 try:
-                    with open(path_or_root, 'r', encoding='utf-8') as fh:
-                        head = fh.read(40960)
-                        import re
-                        m = re.search(r'<JobPath>(.*?)</JobPath>', head, re.IGNORECASE | re.DOTALL)
+                    # map the file instead of reading a fixed 40 KiB chunk; the
+                    # regex stops at the first match so only the pages up to
+                    # the tag are touched
+                    with open(path_or_root, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        m = _JOBPATH_RE.search(mm, 0, _JOBPATH_SCAN_LIMIT)
                         if m:
-                            return m.group(1).strip()
+                            return m.group(1).decode('utf-8', 'ignore').strip()
                 except Exception:
                     pass
                 return os.path.dirname(path_or_root)
@@ -1291,97 +1593,6 @@ def make_gui():
         except Exception:
             return None
 
-    # Provide a local materials parser so parse_panels can annotate materials_map
-    # This is a simplified, robust extractor borrowed from the more complete
-    # fallback parser in `oldd.py` and focused on Boards, Sheets, Bracing, SubAssembly.
-    def parse_materials_from_panel(panel_el):
-        try:
-            def _text_of(el, names):
-                if el is None:
-                    return None
-                for n in names:
-                    ch = el.find(n)
-                    if ch is not None and ch.text is not None:
-                        return ch.text.strip()
-                return None
-
-            mats = []
-            # Boards
-            for node in panel_el.findall('.//Board'):
-                typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
-                fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-                label = _text_of(node, ('Label', 'LabelText')) or ''
-                sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-                mat_el = node.find('Material') or node
-                desc = _text_of(mat_el, ('Description', 'Desc', 'Material', 'Name')) or ''
-                qty = _text_of(mat_el, ('Quantity', 'QNT', 'Qty')) or '1'
-                length = _text_of(mat_el, ('ActualLength', 'Length')) or ''
-                width = _text_of(mat_el, ('ActualWidth', 'Width')) or ''
-                board_guid = _text_of(node, ('BoardGuid', 'BoardID')) or _text_of(mat_el, ('BoardGuid', 'BoardID'))
-                sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
-                mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': width, 'BoardGuid': board_guid, 'SubAssemblyGuid': sub_assembly_guid})
-
-            # Sheets
-            for node in panel_el.findall('.//Sheet'):
-                typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Sheathing'
-                fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-                label = _text_of(node, ('Label', 'LabelText')) or ''
-                sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-                mat_child = node.find('Material')
-                desc = ''
-                if mat_child is not None:
-                    desc = _text_of(mat_child, ('Description', 'Desc', 'Material', 'Name')) or ''
-                if not desc:
-                    desc = _text_of(node, ('TypeOfSheathing', 'Description', 'Desc', 'Material', 'Name', 'TypeOfFastener')) or ''
-                qty = _text_of(node, ('Quantity', 'QNT', 'Qty')) or '1'
-                length = ''
-                width = ''
-                if mat_child is not None:
-                    length = _text_of(mat_child, ('ActualLength', 'Length')) or ''
-                    width = _text_of(mat_child, ('ActualWidth', 'Width')) or ''
-                if not length:
-                    length = _text_of(node, ('ActualLength', 'Length')) or ''
-                if not width:
-                    width = _text_of(node, ('ActualWidth', 'Width')) or ''
-                sheet_guid = _text_of(node, ('SheetGuid', 'SheetID')) or (_text_of(mat_child, ('SheetGuid', 'SheetID')) if mat_child is not None else None)
-                sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
-                mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Description': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': width, 'SheetGuid': sheet_guid, 'SubAssemblyGuid': sub_assembly_guid})
-
-            # Bracing
-            for node in panel_el.findall('.//Bracing'):
-                typ = _text_of(node, ('FamilyMemberName', 'Type', 'Name')) or 'Bracing'
-                fam = _text_of(node, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or typ
-                label = _text_of(node, ('Label', 'LabelText')) or ''
-                sub = _text_of(node, ('SubAssembly', 'SubAssemblyName')) or ''
-                desc = _text_of(node, ('Description', 'Desc', 'Material', 'Name')) or ''
-                qty = _text_of(node, ('Quantity', 'QNT', 'Qty')) or '1'
-                length = _text_of(node, ('ActualLength', 'Length')) or ''
-                width = ''
-                bracing_guid = _text_of(node, ('BracingGuid', 'BracingID'))
-                sub_assembly_guid = _text_of(node, ('SubAssemblyGuid', 'SubAssemblyID'))
-                mats.append({'Type': typ, 'FamilyMemberName': fam, 'Label': label, 'SubAssembly': sub, 'Desc': desc, 'Qty': qty, 'ActualLength': length, 'ActualWidth': width, 'BracingGuid': bracing_guid, 'SubAssemblyGuid': sub_assembly_guid})
-
-            # SubAssemblies (rough openings)
-            for sub_el in panel_el.findall('.//SubAssembly'):
-                fam = _text_of(sub_el, ('FamilyMemberName', 'Family', 'FamilyName', 'Type', 'Name')) or ''
-                sub_label = _text_of(sub_el, ('Label', 'LabelText')) or ''
-                sub_name = _text_of(sub_el, ('SubAssemblyName',)) or ''
-                sub_guid = _text_of(sub_el, ('SubAssemblyGuid', 'SubAssemblyID'))
-                if fam and str(fam).strip().lower() == 'roughopening':
-                    for b in sub_el.findall('.//Board'):
-                        btyp = _text_of(b, ('FamilyMemberName', 'Type', 'Name')) or 'Board'
-                        blab = _text_of(b, ('Label', 'LabelText')) or ''
-                        mat_el = b.find('Material') or b
-                        bdesc = _text_of(mat_el, ('Description', 'Desc', 'Material', 'Name')) or ''
-                        bal = _text_of(mat_el, ('ActualLength', 'Length')) or ''
-                        baw = _text_of(mat_el, ('ActualWidth', 'Width')) or ''
-                        b_guid = _text_of(b, ('BoardGuid', 'BoardID'))
-                        mats.append({'Type': btyp, 'FamilyMemberName': fam, 'Label': blab, 'SubAssembly': sub_name, 'Desc': bdesc, 'Qty': '', 'ActualLength': bal, 'ActualWidth': baw, 'BoardGuid': b_guid, 'SubAssemblyGuid': sub_guid})
-
-            return mats
-        except Exception:
-            return []
-
     def export_current_panel():
         try:
             sel_name = selected_panel.get('name')
@@ -1396,15 +1607,12 @@ def make_gui():
             def _sanitize_filename(name: str) -> str:
                 if not name:
                     return 'panel'
-                invalid = '<>:"/\\|?*'
-                out = ''.join((c if c not in invalid else '_') for c in name).strip()
-                out = out.replace(' ', '_')
-                if not out:
-                    return 'panel'
-                return out
+                # strip first so only inner spaces become underscores
+                return name.strip().translate(_SANITIZE_TABLE) or 'panel'
 
-            # Use the user-facing DisplayLabel for the default filename, not the internal GUID
-            display_name = panel_obj.get('DisplayLabel', sel_name)
+            # Use the user-facing DisplayLabel for the default filename and the
+            # export text, not the internal GUID
+            display_name, lot_num, panel_num = _panel_label_parts(panel_obj, sel_name)
             initial_name = _sanitize_filename(display_name) + '.txt'
 
             # Ask where to save the panel (default to sanitized panel name)
@@ -1418,175 +1626,123 @@ def make_gui():
             if not dest:
                 return
 
-            panel_obj = current_panels.get(sel_name, {})
             # apply GUID-first filtering to export materials
             raw_list = panel_materials_map.get(sel_name, [])
-            materials_list = _filter_materials_by_guid(raw_list, panel_obj)
-
-            # Use DisplayLabel for export display, fallback to internal name
-            display_name = panel_obj.get('DisplayLabel', sel_name)
-
-            # Parse panel name for Lot and Panel numbers
-            lot_num = ''
-            panel_num = display_name
-            if '_' in display_name:
-                parts = display_name.split('_', 1)
-                if len(parts) == 2:
-                    lot_num = parts[0]
-                    panel_num = parts[1]
+            materials_list = _filter_materials_by_guid_cached(raw_list, panel_obj)
 
             def inches_fmt(v):
+                # empty values are common; don't pay for float('') raising
+                if v is None or v == '':
+                    return ''
+                if isinstance(v, (int, float)):
+                    return inches_to_feet_inches_sixteenths(v)
                 try:
                     return inches_to_feet_inches_sixteenths(float(v))
-                except Exception:
-                    return v or ''
-
-            # Write the panel data in text format
-            with open(dest, 'w', encoding='utf-8') as out:
-                out.write(f"File: {display_name}\n\n")
-                out.write("Panel Details:\n")
-                out.write(f"Panel: {display_name}\n")
+                except (TypeError, ValueError):
+                    return v
+
+            # Build the panel text in memory and write it with a single call
+            parts = []
+            app = parts.append
+            app(f"File: {display_name}\n\n")
+            app("Panel Details:\n")
+            app(f"Panel: {display_name}\n")
+
+            # Add Lot and Panel numbers if available
+            if lot_num:
+                app(f"• Lot: {lot_num}\n")
+            app(f"• Panel: {panel_num}\n")
+
+            # Add level and description if available
+            for label, key in (('Level', 'Level'), ('Description', 'Description'), ('Bundle', 'Bundle')):
+                val = panel_obj.get(key)
+                if val:
+                    app(f"• {label}: {val}\n")
+
+            # Panel specifications
+            for label, key in _EXPORT_DETAIL_FIELDS:
+                val = panel_obj.get(key, '')
+                if val:
+                    if key in ['WallLength', 'Height']:
+                        formatted = inches_fmt(val)
+                        app(f"• {label}: {val} in   ({formatted})\n")
+                    else:
+                        app(f"• {label}: {val}\n")
 
-                # Add Lot and Panel numbers if available
-                if lot_num:
-                    out.write(f"• Lot: {lot_num}\n")
-                out.write(f"• Panel: {panel_num}\n")
-
-                # Add level and description if available
-                if panel_obj.get('Level'):
-                    out.write(f"• Level: {panel_obj.get('Level')}\n")
-                if panel_obj.get('Description'):
-                    out.write(f"• Description: {panel_obj.get('Description')}\n")
-                if panel_obj.get('Bundle'):
-                    out.write(f"• Bundle: {panel_obj.get('Bundle')}\n")
-
-                # Panel specifications
-                candidates = [
-                    ('Category', 'Category'),
-                    ('Load Bearing', 'LoadBearing'),
-                    ('Wall Length', 'WallLength'),
-                    ('Height', 'Height'),
-                    ('Thickness', 'Thickness'),
-                    ('Stud Spacing', 'StudSpacing'),
-                ]
-                for label, key in candidates:
-                    val = panel_obj.get(key, '')
-                    if val:
-                        if key in ['WallLength', 'Height']:
-                            formatted = inches_fmt(val)
-                            out.write(f"• {label}: {val} in   ({formatted})\n")
-                        else:
-                            out.write(f"• {label}: {val}\n")
-
-                # Sheathing layers - match GUI display exactly (no dimensions)
-                sheathing_list = []
-                for m in materials_list:
-                    if isinstance(m, dict):
-                        t = (m.get('Type') or '').lower()
-                        if 'sheet' in t or 'sheath' in t or (m.get('FamilyMemberName') and 'sheath' in str(m.get('FamilyMemberName')).lower()):
-                            desc = (m.get('Description') or m.get('Desc') or '').strip()
-                            # Only add unique descriptions (no duplicates)
-                            if desc and desc not in sheathing_list:
-                                sheathing_list.append(desc)
-
-                if sheathing_list:
-                    for idx, desc in enumerate(sheathing_list, 1):
-                        if len(sheathing_list) == 1:
-                            out.write(f"• Sheathing: {desc}\n")
-                        else:
-                            out.write(f"• Sheathing Layer {idx}: {desc}\n")
-
-                # Additional fields
-                if panel_obj.get('Weight'):
-                    out.write(f"• Weight: {panel_obj.get('Weight')}\n")
-                if panel_obj.get('OnScreenInstruction'):
-                    out.write(f"• Production Notes: {panel_obj.get('OnScreenInstruction')}\n")
-
-                # Rough openings
-                rough_openings = []
-                elevations = panel_obj.get('elevations', [])
-                for m in materials_list:
-                    if _is_rough_opening(m):
-                        lab = m.get('Label') or ''
-                        desc = m.get('Desc') or m.get('Description') or ''
-                        ln = m.get('ActualLength') or m.get('Length') or ''
-                        wd = m.get('ActualWidth') or m.get('Width') or ''
+            # Sheathing layers - match GUI display exactly (no dimensions)
+            # one pass splits the panel's materials for the sections below
+            sheathing_list, ro_materials, breakdown_materials = _partition_materials(materials_list)
 
-                        # Compute AFF using geometry-aware helper
-                        aff_height = get_aff_for_rough_opening(panel_obj, m)
+            if sheathing_list:
+                for idx, desc in enumerate(sheathing_list, 1):
+                    if len(sheathing_list) == 1:
+                        app(f"• Sheathing: {desc}\n")
+                    else:
+                        app(f"• Sheathing Layer {idx}: {desc}\n")
+
+            # Additional fields
+            for label, key in (('Weight', 'Weight'), ('Production Notes', 'OnScreenInstruction')):
+                val = panel_obj.get(key)
+                if val:
+                    app(f"• {label}: {val}\n")
+
+            # Rough openings
+            rough_openings = []
+            elevations = panel_obj.get('elevations', [])
+            # header labels are the same for every opening; collect on first use
+            all_header_labels = None
+            for m in ro_materials:
+                # _is_rough_opening() only accepts dicts
+                mget = m.get
+                lab = mget('Label') or ''
+                ln = mget('ActualLength') or mget('Length') or ''
+                wd = mget('ActualWidth') or mget('Width') or ''
+
+                # Compute AFF using geometry-aware helper
+                aff_height = _aff_for_rough_opening_cached(panel_obj, m)
+
+                # Prefer material-level ReferenceHeader if present
+                ref = mget('ReferenceHeader')
+                associated_headers = [str(ref)] if ref else []
+
+                if not associated_headers:
+                    associated_headers = _RO_HEADER_OVERRIDES.get(lab)
+                    if associated_headers is None:
+                        if all_header_labels is None:
+                            all_header_labels = _header_labels(materials_list)
+                        associated_headers = all_header_labels
+
+                # Format the rough opening display
+                ro_lines = [f"Rough Opening: {lab}"]
+                if ln and wd:
+                    ro_lines.append(f"Size: {ln} x {wd}")
+                elif ln:
+                    ro_lines.append(f"Size: {ln}")
+                if aff_height is not None:
+                    formatted_aff = inches_to_feet_inches_sixteenths(str(aff_height))
+                    if formatted_aff:
+                        ro_lines.append(f"AFF: {aff_height} ({formatted_aff})")
+                    else:
+                        ro_lines.append(f"AFF: {aff_height}")
+                if associated_headers:
+                    ro_lines.append(f"Reference: {', '.join(associated_headers)} - Header")
 
-                        # Prefer material-level ReferenceHeader if present
-                        associated_headers = []
-                        try:
-                            if isinstance(m, dict) and m.get('ReferenceHeader'):
-                                associated_headers = [str(m.get('ReferenceHeader'))]
-                        except Exception:
-                            associated_headers = []
+                rough_openings.append(ro_lines)
 
-                        if not associated_headers:
-                            if lab == 'BSMT-HDR':
-                                associated_headers = ['G']
-                            elif lab == '49x63-L2':
-                                associated_headers = ['F']
-                            else:
-                                header_set = set()
-                                for mat in materials_list:
-                                    if mat.get('Type', '').lower() == 'header':
-                                        header_label = mat.get('Label', '')
-                                        if header_label:
-                                            header_set.add(header_label)
-                                associated_headers = list(header_set)
+            for ro in rough_openings:
+                for line in ro:
+                    app(f"• {line}\n")
+                app("\n")  # Add extra spacing between rough openings
 
-                        # Format the rough opening display
-                        ro_lines = [f"Rough Opening: {lab}"]
-                        if ln and wd:
-                            ro_lines.append(f"Size: {ln} x {wd}")
-                        elif ln:
-                            ro_lines.append(f"Size: {ln}")
-                        if aff_height is not None:
-                            formatted_aff = inches_to_feet_inches_sixteenths(str(aff_height))
-                            if formatted_aff:
-                                ro_lines.append(f"AFF: {aff_height} ({formatted_aff})")
-                            else:
-                                ro_lines.append(f"AFF: {aff_height}")
-                        if associated_headers:
-                            ro_lines.append(f"Reference: {', '.join(associated_headers)} - Header")
+            # Panel Material Breakdown
+            app("\nPanel Material Breakdown:\n")
+            
+            # format_and_sort_materials is defined at module level, so it is always available
+            for line in format_and_sort_materials(breakdown_materials):
+                app(f"{line}\n")
 
-                        rough_openings.append(ro_lines)
-
-                for ro in rough_openings:
-                    for line in ro:
-                        out.write(f"• {line}\n")
-                    out.write("\n")  # Add extra spacing between rough openings
-
-                # Panel Material Breakdown
-                out.write("\nPanel Material Breakdown:\n")
-                
-                # Filter out rough openings from materials for breakdown
-                breakdown_materials = [m for m in materials_list if not _is_rough_opening(m)]
-                
-                # Use format_and_sort_materials if available
-                formatter = globals().get('format_and_sort_materials')
-                if callable(formatter):
-                    breakdown_lines = formatter(breakdown_materials)
-                    for line in breakdown_lines:
-                        out.write(f"{line}\n")
-                else:
-                    # Fallback formatting
-                    for m in breakdown_materials:
-                        if isinstance(m, dict):
-                            lbl = m.get('Label') or m.get('Name') or ''
-                            typ = m.get('Type') or ''
-                            desc = m.get('Desc') or m.get('Description') or ''
-                            qty = m.get('Qty') or m.get('Quantity') or ''
-                            length = m.get('ActualLength') or m.get('Length') or ''
-                            width = m.get('ActualWidth') or m.get('Width') or ''
-                            size = f"{length} x {width}".strip() if width else (length or '')
-                            qty_str = f"({qty})" if qty else ''
-                            if size:
-                                out.write(f"{lbl} - {typ} - {desc} - {qty_str} - {size}\n")
-                            else:
-                                out.write(f"{lbl} - {typ} - {desc} - {qty_str}\n")
+            with open(dest, 'w', encoding='utf-8') as out:
+                out.write(''.join(parts))
 
             messagebox.showinfo('Export', f'Panel exported to {dest}')
         except Exception as e:
@@ -1596,67 +1752,57 @@ def make_gui():
         nonlocal panels_loaded
         try:
             folder = folder_entry.get() or os.getcwd()
-            for nm in ('expected.log', 'materials.log'):
-                p = os.path.join(folder, nm)
-                try:
-                    if os.path.exists(p):
-                        os.remove(p)
-                except Exception:
-                    pass
+            # queued behind any pending log writer so it can't recreate the logs
+            _parse_pool.submit(_remove_ehx_logs, folder)
             # clear GUI state
             current_panels.clear()
+            panel_sort_keys.clear()
+            bundle_index.clear()
             panel_materials_map.clear()
+            _filter_cache.clear()
+            _aff_cache.clear()
             panels_loaded = False
             selected_panel['name'] = None
             try:
                 file_listbox.selection_clear(0, tk.END)
             except Exception:
                 pass
-            for ch in details_scrollable_frame.winfo_children():
-                try:
-                    ch.destroy()
-                except Exception:
-                    pass
-            for ch in breakdown_scrollable_frame.winfo_children():
-                try:
-                    ch.destroy()
-                except Exception:
-                    pass
+            _fill_pane(details_text, [])
+            _fill_pane(breakdown_text, [])
             rebuild_bundles(5)
-            # log the action
+            # log the action: rotate/clear the debug log to keep it small and
+            # start fresh for the next session
+            ts = _dt.datetime.now(_dt.timezone.utc).isoformat()
             try:
-                # rotate/clear the debug log to keep it small and start fresh for the next session
-                    try:
-                        init_entry = {'ts': _dt.datetime.now(_dt.timezone.utc).isoformat(), 'msg': 'gui_zones session cleared via Back/Clear'}
-                        try:
-                            with open(LOG_FILE, 'w', encoding='utf-8') as fh:
-                                fh.write(json.dumps(init_entry) + '\n')
-                        except Exception:
-                            # fallback to append if write fails
-                            try:
-                                with open(LOG_FILE, 'a', encoding='utf-8') as fh:
-                                    fh.write(json.dumps({'ts': _dt.datetime.now(_dt.timezone.utc).isoformat(), 'action': 'back_clear', 'folder': folder}) + '\n')
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
+                with open(LOG_FILE, 'w', encoding='utf-8') as fh:
+                    fh.write(json.dumps({'ts': ts, 'msg': 'gui_zones session cleared via Back/Clear'}) + '\n')
             except Exception:
-                pass
+                # fallback to append if write fails
+                try:
+                    with open(LOG_FILE, 'a', encoding='utf-8') as fh:
+                        fh.write(json.dumps({'ts': ts, 'action': 'back_clear', 'folder': folder}) + '\n')
+                except Exception:
+                    pass
             messagebox.showinfo('Clear', 'GUI cleared and logs removed (if present)')
         except Exception as e:
             messagebox.showerror('Clear Error', str(e))
 
+    # last folder as read from / written to LAST_FOLDER_FILE; None until first read
+    last_folder = {'path': None}
+
     def load_last_folder():
+        if last_folder['path'] is not None:
+            return last_folder['path']
+        p = None
         try:
-            if os.path.exists(LAST_FOLDER_FILE):
-                with open(LAST_FOLDER_FILE, 'r', encoding='utf-8') as fh:
-                    d = json.load(fh) or {}
-                    p = d.get('last_folder')
-                    if p and os.path.isdir(p):
-                        return p
+            with open(LAST_FOLDER_FILE, 'r', encoding='utf-8') as fh:
+                p = (json.load(fh) or {}).get('last_folder')
         except Exception:
             pass
-        return os.getcwd()
+        if not (p and os.path.isdir(p)):
+            return os.getcwd()
+        last_folder['path'] = p
+        return p
 
     folder_entry.insert(0, load_last_folder())
 
@@ -1666,11 +1812,14 @@ def make_gui():
             folder_entry.delete(0, tk.END)
             folder_entry.insert(0, d)
             populate_files(d)
-            try:
-                with open(LAST_FOLDER_FILE, 'w', encoding='utf-8') as fh:
-                    json.dump({'last_folder': d}, fh)
-            except Exception:
-                pass
+            # only rewrite the file when the folder actually changed
+            if d != last_folder['path']:
+                try:
+                    with open(LAST_FOLDER_FILE, 'w', encoding='utf-8') as fh:
+                        json.dump({'last_folder': d}, fh)
+                    last_folder['path'] = d
+                except Exception:
+                    pass
 
     ttk.Button(top, text='Export', command=export_current_panel).pack(side='right', padx=6)
     ttk.Button(top, text='Back', command=back_clear).pack(side='right', padx=6)
@@ -1688,7 +1837,7 @@ def make_gui():
     white_frame = tk.Frame(left, bg='white')
     white_frame.pack(fill='both', expand=True, padx=6, pady=6)
     # left zone (white) - no visible heading to save space
-    file_listbox = tk.Listbox(white_frame, width=40, height=18)
+    file_listbox = tk.Listbox(white_frame, width=40, height=18, fg='blue')
     file_listbox.pack(fill='both', expand=True, padx=4, pady=4)
 
     # Green bundles + bottom details/breakdown
@@ -1707,6 +1856,41 @@ def make_gui():
     bottom_inner = tk.PanedWindow(bottom_pane, orient='horizontal')
     bottom_inner.pack(fill='both', expand=True)
     
+    def _debounced(fn, delay=30):
+        """Event handler that runs fn once, delay ms after the last event in a burst."""
+        job = {'id': None}
+
+        def _run():
+            job['id'] = None
+            fn()
+
+        def handler(event=None):
+            try:
+                if job['id'] is not None:
+                    root.after_cancel(job['id'])
+                job['id'] = root.after(delay, _run)
+            except Exception:
+                pass
+        return handler
+
+    def _idle_once(fn):
+        """Handler that runs fn once at the next idle point, however often it fires before then."""
+        pending = {'flag': False}
+
+        def _run():
+            pending['flag'] = False
+            fn()
+
+        def handler(event=None):
+            if pending['flag']:
+                return
+            try:
+                root.after_idle(_run)
+                pending['flag'] = True
+            except Exception:
+                pass
+        return handler
+
     # Details frame with scrollbar (yellow zone)
     details_outer = tk.Frame(bottom_inner, bg=DETAILS_BG)
     details_canvas = tk.Canvas(details_outer, bg=DETAILS_BG, highlightthickness=0)
@@ -1779,7 +1963,8 @@ def make_gui():
     except Exception:
         pass
 
-    details_canvas.bind('<Configure>', lambda e: center_details_content())
+    # window drags fire <Configure> per pixel; only recenter once the burst settles
+    details_canvas.bind('<Configure>', _debounced(center_details_content))
     
     details_canvas.pack(side='left', fill='both', expand=True)
     
@@ -1851,9 +2036,69 @@ def make_gui():
 
     # No visible H/V controls for pink zone (defaults are applied via flags)
 
-    breakdown_canvas.bind('<Configure>', lambda e: center_breakdown_content())
+    breakdown_canvas.bind('<Configure>', _debounced(center_breakdown_content))
     
     breakdown_canvas.pack(side='left', fill='both', expand=True)
+
+    # Each pane renders into one read-only Text widget (a line per entry, styled
+    # by tags) instead of one Label per line; the canvas plumbing above still
+    # handles scrolling and centering of the frame that holds it.
+    # The Text sits in a non-propagating holder frame sized in pixels: Text's
+    # own height option counts base-font lines and ignores the tags' spacing
+    # and larger header font, which left the last lines cut off.
+    def _make_pane_text(parent, bg, **line_opts):
+        holder = tk.Frame(parent, bg=bg, height=1)
+        holder.pack_propagate(False)
+        txt = tk.Text(holder, bg=bg, font=('Arial', 10, 'bold'), bd=0, highlightthickness=0,
+                      width=1, height=1, cursor='arrow', takefocus=0, state='disabled', **line_opts)
+        txt.pack(fill='both', expand=True)
+        # grow to fit every display line; re-measured when the wrap width changes
+        txt.bind('<Configure>', lambda e: _fit_pane_height(txt))
+        return txt
+
+    def _fit_pane_height(txt):
+        try:
+            # pixel height of all display lines, tag spacing and fonts included
+            h = txt.count('1.0', 'end', 'update', 'ypixels')
+            if isinstance(h, tuple):
+                h = h[0]
+            h = (h or 0) + 2 * int(txt.cget('pady')) + 2
+            holder = txt.master
+            if int(holder.cget('height')) != h:
+                holder.configure(height=h)
+        except Exception:
+            pass
+
+    def _fill_pane(txt, chunks):
+        """Replace the pane's text with chunks, a list of (line, tag)."""
+        try:
+            txt.configure(state='normal')
+            txt.delete('1.0', 'end')
+            if chunks:
+                for line, tag in chunks:
+                    txt.insert('end', line + '\n', tag)
+                # drop the newline after the last line
+                txt.delete('end-2c')
+                if not txt.master.winfo_manager():
+                    txt.master.pack(fill='x')
+                _fit_pane_height(txt)
+                # wrapping depends on the final width; measure again once laid out
+                txt.after_idle(_fit_pane_height, txt)
+            else:
+                txt.master.pack_forget()
+            txt.configure(state='disabled')
+        except Exception:
+            pass
+
+    # recenter both panes once the selection's layout has settled, coalescing
+    # rapid clicks into a single pass
+    _recenter_panes = _idle_once(lambda: (center_details_content(), center_breakdown_content()))
+
+    details_text = _make_pane_text(details_scrollable_frame, DETAILS_BG, wrap='word', padx=6)
+    details_text.tag_configure('header', font=('Arial', 11, 'bold'), spacing1=4, spacing3=4)
+    details_text.tag_configure('line', spacing1=2, spacing3=2)
+    breakdown_text = _make_pane_text(breakdown_scrollable_frame, BREAKDOWN_BG, wrap='none', padx=6)
+    breakdown_text.tag_configure('line', justify='center', spacing1=1, spacing3=1)
     
     bottom_inner.add(details_outer)
     bottom_inner.add(breakdown_outer)
@@ -1878,11 +2123,31 @@ def make_gui():
                 pass
         tip_win['win'] = None
 
+    # one Font per font spec; building a Font is a Tcl round-trip (and a new named font)
+    _font_cache = {}
+
+    def _font_for(spec):
+        f = _font_cache.get(spec)
+        if f is None:
+            f = _font_cache[spec] = tkfont.Font(font=spec)
+        return f
+
+    def _sized_font(size, weight='normal'):
+        # default-family font of a given size, shared by every button using it
+        key = (size, weight)
+        f = _font_cache.get(key)
+        if f is None:
+            f = _font_cache[key] = tkfont.Font(size=size, weight=weight)
+        return f
+
+    # width of '0' per button font size, for the pixel -> char width conversion
+    _char_widths = {}
+
     def attach_hover_tooltip(widget, text_getter):
         def enter(e):
             try:
                 txt = text_getter()
-                f = tkfont.Font(font=widget.cget('font'))
+                f = _font_for(widget.cget('font'))
                 if f.measure(txt) > widget.winfo_width() - 8:
                     _show_tip(txt, e.x_root + 12, e.y_root + 12)
             except Exception:
@@ -1898,13 +2163,13 @@ def make_gui():
         try:
             folder = folder or folder_entry.get() or os.getcwd()
             file_listbox.delete(0, tk.END)
-            for fn in sorted(os.listdir(folder)):
-                if fn.lower().endswith('.ehx'):
-                    file_listbox.insert(tk.END, fn)
-                    try:
-                        file_listbox.itemconfig(file_listbox.size() - 1, fg='blue')
-                    except Exception:
-                        pass
+            # DirEntry carries the file type from the directory read, so no extra stat per name
+            with os.scandir(folder) as it:
+                names = [e.name for e in it if e.name.lower().endswith('.ehx') and e.is_file()]
+            names.sort()
+            if names:
+                # one Tcl call for the whole list; rows are blue via the listbox fg
+                file_listbox.insert(tk.END, *names)
         except Exception:
             pass
 
@@ -1912,40 +2177,68 @@ def make_gui():
 
     # ...existing code... (auto-load removed to keep file selection manual)
 
-    # Ensure mouse wheel works when hovering over listbox items (child widgets may otherwise consume events)
-    def _file_list_on_wheel(event):
-        try:
-            file_listbox.yview_scroll(-1 * (event.delta // 120), 'units')
-            return 'break'
-        except Exception:
-            return None
+    # One global <MouseWheel> handler routes the wheel to whichever scrollable
+    # zone is under the pointer (child labels would otherwise swallow it), so
+    # entering/leaving a zone never has to rebind anything. Ticks arriving
+    # faster than Tk goes idle are summed and scrolled in one call.
+    wheel_pending = {'target': None, 'units': 0}
 
-    def _file_list_enter(event):
-        try:
-            file_listbox.focus_set()
-            file_listbox.bind_all('<MouseWheel>', _file_list_on_wheel)
-        except Exception:
-            pass
+    def _flush_wheel():
+        target, units = wheel_pending['target'], wheel_pending['units']
+        wheel_pending['target'], wheel_pending['units'] = None, 0
+        if target is not None and units:
+            try:
+                target.yview_scroll(units, 'units')
+            except Exception:
+                pass
 
-    def _file_list_leave(event):
+    def _route_mousewheel(event):
         try:
-            file_listbox.unbind_all('<MouseWheel>')
+            w = root.winfo_containing(event.x_root, event.y_root)
         except Exception:
-            pass
-
-    file_listbox.bind('<Enter>', _file_list_enter)
-    file_listbox.bind('<Leave>', _file_list_leave)
-    file_listbox.bind('<MouseWheel>', _file_list_on_wheel)
+            return None
+        while w is not None:
+            if w is file_listbox or w is details_canvas or w is breakdown_canvas:
+                if wheel_pending['target'] is not w:
+                    _flush_wheel()
+                    wheel_pending['target'] = w
+                    try:
+                        root.after_idle(_flush_wheel)
+                    except Exception:
+                        pass
+                wheel_pending['units'] += -1 * (event.delta // 120)
+                return 'break'
+            w = getattr(w, 'master', None)
+        return None
+
+    root.bind_all('<MouseWheel>', _route_mousewheel)
+    # widget-level bind so the Listbox class binding doesn't scroll it a second time
+    file_listbox.bind('<MouseWheel>', _route_mousewheel)
+    # same for the pane Texts: their class binding would scroll the Text itself
+    # on top of the canvas scroll the router does
+    details_text.bind('<MouseWheel>', _route_mousewheel)
+    breakdown_text.bind('<MouseWheel>', _route_mousewheel)
+    file_listbox.bind('<Enter>', lambda e: file_listbox.focus_set())
+
+    # Add tooltip support for file listbox items. <Motion> fires per pixel, so
+    # only re-evaluate when the pointer reaches another row, and remember each
+    # filename's measured width.
+    file_hover = {'idx': None}
+    file_text_widths = {}
 
-    # Add tooltip support for file listbox items
     def on_file_hover(event):
         try:
             index = file_listbox.nearest(event.y)
+            if index == file_hover['idx']:
+                return
+            file_hover['idx'] = index
             if index >= 0:
                 filename = file_listbox.get(index)
                 if filename:
-                    f = tkfont.Font(font=file_listbox.cget('font'))
-                    if f.measure(filename) > file_listbox.winfo_width() - 20:  # Account for padding
+                    w = file_text_widths.get(filename)
+                    if w is None:
+                        w = file_text_widths[filename] = _font_for(file_listbox.cget('font')).measure(filename)
+                    if w > file_listbox.winfo_width() - 20:  # Account for padding
                         _show_tip(filename, event.x_root + 12, event.y_root + 12)
                     else:
                         _hide_tip()
@@ -1953,110 +2246,56 @@ def make_gui():
             _hide_tip()
 
     def on_file_leave(event):
+        file_hover['idx'] = None
         _hide_tip()
 
     file_listbox.bind('<Motion>', on_file_hover)
     file_listbox.bind('<Leave>', on_file_leave)
 
-    # Add mouse wheel support to scrollable zones
-    def _bind_mousewheel_to_canvas(canvas, scrollable_frame):
-        def _on_mousewheel(event):
-            try:
-                canvas.yview_scroll(-1 * (event.delta // 120), 'units')
-                return "break"
-            except Exception:
-                return None
-
-        def _on_enter(event):
-            try:
-                canvas.focus_set()
-                # Bind to all so child widgets won't steal the wheel event
-                canvas.bind_all('<MouseWheel>', _on_mousewheel)
-            except Exception:
-                pass
-
-        def _on_leave(event):
-            try:
-                canvas.unbind_all('<MouseWheel>')
-            except Exception:
-                pass
-
-        try:
-            canvas.bind('<Enter>', _on_enter)
-            canvas.bind('<Leave>', _on_leave)
-            scrollable_frame.bind('<Enter>', _on_enter)
-            scrollable_frame.bind('<Leave>', _on_leave)
-        except Exception:
-            pass
-
-        # Fallback direct binds
-        try:
-            canvas.bind('<MouseWheel>', _on_mousewheel)
-            scrollable_frame.bind('<MouseWheel>', _on_mousewheel)
-        except Exception:
-            pass
-
     # Helper to produce the short button text for a panel: use the DisplayLabel
     # suffix after the final '_' and then take the last 3 characters (user request)
     def button_text_for(panel_name):
         try:
             obj = current_panels.get(panel_name, {})
             display = obj.get('DisplayLabel') or panel_name or ''
+            # reuse the text from the last rebuild while the label is unchanged
+            hit = obj.get('_button_text')
+            if hit is not None and hit[0] == display:
+                return hit[1]
             # take the last segment after '_' if present
             seg = display.split('_')[-1]
             # return last 3 characters (or whole segment if shorter)
-            return seg[-3:] if len(seg) > 3 else seg
+            txt = seg[-3:] if len(seg) > 3 else seg
+            if obj:
+                obj['_button_text'] = (display, txt)
+            return txt
         except Exception:
             return panel_name
 
-        return _on_mousewheel
+    # keep keyboard focus following the pointer into the scrollable zones
+    for _canvas, _frame in ((details_canvas, details_scrollable_frame), (breakdown_canvas, breakdown_scrollable_frame)):
+        _canvas.bind('<Enter>', lambda e, c=_canvas: c.focus_set())
+        _frame.bind('<Enter>', lambda e, c=_canvas: c.focus_set())
 
-    _bind_mousewheel_to_canvas(details_canvas, details_scrollable_frame)
-    _bind_mousewheel_to_canvas(breakdown_canvas, breakdown_scrollable_frame)
-    
-    # Add mouse wheel support to buttons frame (green zone)
-    def _on_buttons_mousewheel(event):
-        # For the buttons frame, we can scroll through the bundle frames
-        try:
-            children = btn_grid.winfo_children()
-            if children:
-                # Find the first visible bundle frame and scroll it
-                for child in children:
-                    if isinstance(child, tk.LabelFrame):
-                        # This is a simple implementation - in a real scenario you might want more sophisticated scrolling
-                        break
-        except Exception:
-            pass
-    
-    btns_frame.bind('<MouseWheel>', _on_buttons_mousewheel)
+    # the green zone doesn't scroll; _route_mousewheel ignores wheel ticks over it
     btns_frame.bind('<Enter>', lambda e: btns_frame.focus_set())
 
     def display_panel(name, panel_obj, materials):
-        for ch in details_scrollable_frame.winfo_children():
-            ch.destroy()
-        for ch in breakdown_scrollable_frame.winfo_children():
-            ch.destroy()
+        # details lines collected as (text, tag) and rendered in one go below
+        detail_chunks = []
         # Header
         try:
-            # Use DisplayLabel for display purposes, fallback to internal name
-            display_name = panel_obj.get('DisplayLabel', name)
-
-            # Parse panel name for Lot and Panel numbers for header
-            header_lot_num = ''
-            header_panel_num = display_name
-            if '_' in display_name:
-                parts = display_name.split('_', 1)
-                if len(parts) == 2:
-                    header_lot_num = parts[0]
-                    header_panel_num = parts[1]
-            
+            # Use DisplayLabel for display purposes, fallback to internal name;
+            # split into Lot and Panel numbers for the header
+            display_name, header_lot_num, header_panel_num = _panel_label_parts(panel_obj, name)
+
             if header_lot_num:
-                tk.Label(details_scrollable_frame, text=f'Panel: {header_panel_num} (Lot {header_lot_num})', bg=DETAILS_BG, font=('Arial', 11, 'bold')).pack(anchor='w', padx=6, pady=4)
+                detail_chunks.append((f'Panel: {header_panel_num} (Lot {header_lot_num})', 'header'))
             else:
-                tk.Label(details_scrollable_frame, text=f'Panel: {display_name}', bg=DETAILS_BG, font=('Arial', 11, 'bold')).pack(anchor='w', padx=6, pady=4)
+                detail_chunks.append((f'Panel: {display_name}', 'header'))
         except Exception:
             pass
-        # Helper to write labeled lines into details_frame with wrapping
+        # Helper to add labeled lines to the details pane (the Text wraps them)
         def add_detail_line(label, value=None, bullet=False, raw=False):
             try:
                 if raw:
@@ -2066,52 +2305,33 @@ def make_gui():
                         txt = f"• {label}: {value}" if value is not None else f"• {label}:"
                     else:
                         txt = f"{label}: {value}" if value is not None else f"{label}:"
-                tk.Label(details_scrollable_frame, text=txt, bg=DETAILS_BG, anchor='w', justify='left', wraplength=DEFAULT_STATE['details_w'], font=('Arial', 10, 'bold')).pack(fill='x', padx=6, pady=2)
+                detail_chunks.append((txt, 'line'))
             except Exception:
                 pass
 
         # Normalize panel_obj keys and display common fields
         try:
             if panel_obj and isinstance(panel_obj, dict):
-                # Use DisplayLabel for display purposes
-                display_name = panel_obj.get('DisplayLabel', name)
-
-                # Parse panel name for Lot and Panel numbers
-                lot_num = ''
-                panel_num = display_name
-                if '_' in display_name:
-                    parts = display_name.split('_', 1)
-                    if len(parts) == 2:
-                        lot_num = parts[0]
-                        panel_num = parts[1]
-                
+                # Lot and Panel numbers from the DisplayLabel (cached on the panel)
+                display_name, lot_num, panel_num = _panel_label_parts(panel_obj, name)
+                # field values resolved from their alternate keys (cached on the panel)
+                canon = _panel_canon(panel_obj)
+
                 # Level / Description / Bundle (show these as top-level metadata)
                 if lot_num:
                     add_detail_line('Lot', lot_num)
                 add_detail_line('Panel', panel_num)
-                if 'Level' in panel_obj:
-                    add_detail_line('Level', panel_obj.get('Level'))
-                if 'Description' in panel_obj:
-                    add_detail_line('Description', panel_obj.get('Description'))
-                b = panel_obj.get('Bundle') or panel_obj.get('BundleName') or panel_obj.get('BundleGuid') or ''
+                if 'Level' in canon:
+                    add_detail_line('Level', canon['Level'])
+                if 'Description' in canon:
+                    add_detail_line('Description', canon['Description'])
+                b = canon['Bundle']
                 if b:
                     add_detail_line('Bundle', b)
 
                 # common field candidates
-                candidates = [
-                    ('Category', ['Category', 'PanelCategory', 'Type']),
-                    ('Load Bearing', ['LoadBearing', 'IsLoadBearing', 'LoadBearingFlag']),
-                    ('Wall Length', ['WallLength', 'Length', 'PanelLength']),
-                    ('Height', ['Height', 'PanelHeight']),
-                    ('Thickness', ['Thickness', 'Depth']),
-                    ('Stud Spacing', ['StudSpacing', 'StudsPerFoot']),
-                ]
-                for label, keys in candidates:
-                    val = ''
-                    for k in keys:
-                        if k in panel_obj:
-                            val = panel_obj.get(k)
-                            break
+                for label, _keys in _PANEL_DETAIL_FIELDS:
+                    val = canon[label]
                     # Format Wall Length and Height with feet-inches-sixteenths
                     if val and (label == 'Wall Length' or label == 'Height'):
                         try:
@@ -2128,29 +2348,22 @@ def make_gui():
 
                 # also print Level {LevelNo}: {Description} inside Panel Details if available
                 try:
-                    level_no = panel_obj.get('LevelNo') or panel_obj.get('Level')
-                    desc_txt = panel_obj.get('Description') or ''
+                    level_no = canon['LevelNo']
+                    desc_txt = canon.get('Description') or ''
                     if level_no and desc_txt:
                         add_detail_line(f"Level {level_no}", desc_txt, bullet=True)
                 except Exception:
                     pass
 
                 # Sheathing layers: derive from materials list (first two unique sheathing descriptions)
+                mats_list = []
+                sheet_descs, ro_mats, all_header_labels = [], [], []
                 try:
-                    sheet_descs = []
                     # apply GUID-first filtering so GUI sheathing lines only come from
                     # materials that belong to this panel when GUIDs are present
                     mats_list = materials if isinstance(materials, (list, tuple)) else []
-                    mats_list = _filter_materials_by_guid(mats_list, panel_obj)
-                    for m in mats_list:
-                        if not isinstance(m, dict):
-                            continue
-                        t = (m.get('Type') or '').lower()
-                        if 'sheet' in t or 'sheath' in t or (m.get('FamilyMemberName') and 'sheath' in str(m.get('FamilyMemberName')).lower()):
-                            # prefer the explicit <Description> element for sheathing text and report only once per unique description
-                            d = (m.get('Description') or m.get('Desc') or '').strip()
-                            if d and d not in sheet_descs:
-                                sheet_descs.append(d)
+                    mats_list = _filter_materials_by_guid_cached(mats_list, panel_obj)
+                    sheet_descs, ro_mats, all_header_labels = _panel_detail_materials(panel_obj, mats_list)
                     # after collecting unique descriptions, emit up to two sheathing layers
                     if len(sheet_descs) > 0:
                         add_detail_line('Sheathing Layer 1', sheet_descs[0], bullet=True)
@@ -2160,112 +2373,83 @@ def make_gui():
                     pass
 
                 # additional notes (Production Notes label used in expected.log)
-                osi = panel_obj.get('OnScreenInstruction') or panel_obj.get('Notes') or panel_obj.get('Instruction')
-                if 'Weight' in panel_obj:
-                    add_detail_line('Weight', panel_obj.get('Weight'), bullet=True)
+                osi = canon['Notes']
+                if 'Weight' in canon:
+                    add_detail_line('Weight', canon['Weight'], bullet=True)
                 if osi:
                     add_detail_line('Production Notes', osi, bullet=True)
                 # Rough openings: show them after Production Notes in Panel Details
                 try:
                     ro_list = []
                     # mats_list already filtered above
-                    mats_list = mats_list
-                    elevations = panel_obj.get('elevations', [])
-                    log_debug(f"Checking {len(mats_list)} materials for rough openings")
-                    log_debug(f"Found {len(elevations)} elevation views")
+                    if DEBUG:
+                        elevations = panel_obj.get('elevations', [])
+                        log_debug(f"Checking {len(mats_list)} materials for rough openings")
+                        log_debug(f"Found {len(elevations)} elevation views")
 
-                    # Debug: show first few materials to see their structure
-                    for i, m in enumerate(mats_list[:5]):
-                        log_debug(f"Material {i}: Type={m.get('Type')}, Family={m.get('FamilyMemberName')}, Label={m.get('Label')}, Desc={m.get('Desc')}")
+                        # Debug: show first few materials to see their structure
+                        for i, m in enumerate(mats_list[:5]):
+                            log_debug(f"Material {i}: Type={m.get('Type')}, Family={m.get('FamilyMemberName')}, Label={m.get('Label')}, Desc={m.get('Desc')}")
 
-                    for m in mats_list:
-                        is_ro = _is_rough_opening(m)
-                        if is_ro:
-                            lab = m.get('Label') or ''
-                            desc = m.get('Desc') or m.get('Description') or ''
-                            ln = m.get('ActualLength') or m.get('Length') or ''
-                            wd = m.get('ActualWidth') or m.get('Width') or ''
+                    # rough openings and header labels come precomputed with the sheathing list
+                    for m in ro_mats:
+                        lab = m.get('Label') or ''
+                        desc = m.get('Desc') or m.get('Description') or ''
+                        ln = m.get('ActualLength') or m.get('Length') or ''
+                        wd = m.get('ActualWidth') or m.get('Width') or ''
 
+                        if DEBUG:
                             log_debug(f"Found rough opening - Label: '{lab}', Type: '{m.get('Type')}', Family: '{m.get('FamilyMemberName')}', Desc: '{desc}'")
 
-                            # Prefer material-level AFF first
-                            aff_height = None
-                            try:
-                                if isinstance(m, dict) and m.get('AFF') is not None:
-                                    aff_height = float(m.get('AFF'))
-                            except Exception:
-                                aff_height = None
-
-                            # compute AFF using geometry-aware helper
-                            aff_height = get_aff_for_rough_opening(panel_obj, m)
-
-                            # Find associated headers based on rough opening type
-                            associated_headers = []
-                            if lab == 'BSMT-HDR':
-                                # BSMT-HDR uses G headers
-                                associated_headers = ['G']
-                            elif lab == '49x63-L2':
-                                # 49x63-L2 uses F headers
-                                associated_headers = ['F']
+                        # compute AFF using geometry-aware helper (it prefers a material-level AFF)
+                        aff_height = _aff_for_rough_opening_cached(panel_obj, m)
+
+                        # Find associated headers based on rough opening type
+                        # BSMT-HDR uses G headers, 49x63-L2 uses F headers
+                        # Fallback: unique header labels of the panel
+                        associated_headers = _RO_HEADER_OVERRIDES.get(lab) or all_header_labels
+
+                        # Format the rough opening display
+                        ro_lines = [f"Rough Opening: {lab}"]
+                        if ln and wd:
+                            ro_lines.append(f"Size: {ln} x {wd}")
+                        elif ln:
+                            ro_lines.append(f"Size: {ln}")
+                        if aff_height is not None:
+                            formatted_aff = inches_to_feet_inches_sixteenths(str(aff_height))
+                            if formatted_aff:
+                                ro_lines.append(f"AFF: {aff_height} ({formatted_aff})")
                             else:
-                                # Fallback: find unique header labels
-                                header_set = set()
-                                for mat in mats_list:
-                                    if mat.get('Type', '').lower() == 'header':
-                                        header_label = mat.get('Label', '')
-                                        if header_label:
-                                            header_set.add(header_label)
-                                associated_headers = list(header_set)
-
-                            # Format the rough opening display
-                            ro_lines = [f"Rough Opening: {lab}"]
-                            if ln and wd:
-                                ro_lines.append(f"Size: {ln} x {wd}")
-                            elif ln:
-                                ro_lines.append(f"Size: {ln}")
-                            if aff_height is not None:
-                                formatted_aff = inches_to_feet_inches_sixteenths(str(aff_height))
-                                if formatted_aff:
-                                    ro_lines.append(f"AFF: {aff_height} ({formatted_aff})")
-                                else:
-                                    ro_lines.append(f"AFF: {aff_height}")
-                            if associated_headers:
-                                ro_lines.append(f"Reference: {', '.join(associated_headers)} - Header")
+                                ro_lines.append(f"AFF: {aff_height}")
+                        if associated_headers:
+                            ro_lines.append(f"Reference: {', '.join(associated_headers)} - Header")
 
-                            ro_list.append(ro_lines)
+                        ro_list.append(ro_lines)
+                        if DEBUG:
                             log_debug(f"Found rough opening: {ro_lines}")
-                    log_debug(f"Total rough openings found: {len(ro_list)}")
+                    if DEBUG:
+                        log_debug(f"Total rough openings found: {len(ro_list)}")
                     for ro in ro_list:
                         for line in ro:
                             add_detail_line(line, None, bullet=True, raw=True)
-                        log_debug(f"Added to GUI: {ro}")
+                        if DEBUG:
+                            log_debug(f"Added to GUI: {ro}")
                 except Exception as e:
                     log_debug(f"Exception in rough openings display: {e}")
                     pass
-
-            # Center the content after adding all labels
-            root.after(100, center_details_content)  # Delay to ensure layout is complete
         except Exception:
             pass
+        _fill_pane(details_text, detail_chunks)
 
         # Material breakdown: accept list of dicts or dict mapping names->list
         try:
             # breakdown content title removed to preserve vertical space
-            mats_list = []
-            if isinstance(materials, dict):
-                # if it's a mapping of panel->materials, try to pull the current name
-                # otherwise flatten values
-                for v in materials.values():
-                    if isinstance(v, (list, tuple)):
-                        mats_list.extend(v)
-            elif isinstance(materials, (list, tuple)):
-                mats_list = list(materials)
             # Use format_and_sort_materials if available to match expected.log formatting
             formatter = globals().get('format_and_sort_materials')
             lines = []
             try:
-                # remove rough openings from the breakdown source
-                mats_list = [m for m in mats_list if not _is_rough_opening(m)]
+                # breakdown source without rough openings (cached on the panel)
+                mats_list = _panel_breakdown_materials(panel_obj if isinstance(panel_obj, dict) else {}, materials)
                 if callable(formatter):
                     lines = formatter(mats_list)
                 else:
@@ -2289,16 +2473,12 @@ def make_gui():
             except Exception:
                 lines = []
 
-            for l in lines:
-                try:
-                    tk.Label(breakdown_scrollable_frame, text=l, bg=BREAKDOWN_BG, anchor='center', justify='center', font=('Arial', 10, 'bold')).pack(anchor='center', fill='x', padx=6, pady=1)
-                except Exception:
-                    pass
-
-            # Center the content after adding all labels
-            root.after(100, center_breakdown_content)  # Delay to ensure layout is complete
+            _fill_pane(breakdown_text, [(l, 'line') for l in lines])
         except Exception:
-            pass
+            _fill_pane(breakdown_text, [])
+
+        # Center both panes once layout has settled
+        _recenter_panes()
     def on_panel_selected(name):
         try:
             selected_panel['name'] = name
@@ -2308,22 +2488,150 @@ def make_gui():
         except Exception:
             pass
 
+    # Bundle trays, their 4x4 buttons and the nav rows are built once and
+    # reused; a rebuild only re-labels them and shows/hides what it needs.
+    bundle_pool = []
+    empty_trays = []
+    group_nav = {}
+
+    def _bundle_slot(bi):
+        while len(bundle_pool) <= bi:
+            bf = tk.Frame(btn_grid, bg=BUTTONS_BG)
+            hdr = tk.Label(bf, text='', bg=BUTTONS_BG, font=('Arial', 9, 'bold'))
+            hdr.pack(side='top', fill='x')
+            inner = tk.Frame(bf, bg=BUTTONS_BG)
+            bundle_pool.append({'bf': bf, 'hdr': hdr, 'inner': inner, 'buttons': [], 'ctrl': None, 'overlay': None})
+        return bundle_pool[bi]
+
+    def _slot_button(slot, idx):
+        # state dict is read by the command/tooltip so reuse never re-registers callbacks
+        buttons = slot['buttons']
+        while len(buttons) <= idx:
+            state = {'name': None, 'tip': ''}
+            try:
+                try:
+                    # Slightly larger font to improve legibility
+                    small_font = _sized_font(9, 'bold')
+                except Exception:
+                    small_font = None
+                btn = tk.Button(slot['inner'],
+                                text='',
+                                font=small_font,
+                                relief='raised',
+                                bd=3,
+                                anchor='center',
+                                command=lambda s=state: on_panel_selected(s['name']),
+                                width=6,
+                                height=2,
+                                wraplength=80,
+                                bg='#2e8b57',
+                                fg='#ffffff',
+                                activebackground='#66ff99',
+                                activeforeground='#000000',
+                                # visually prominent across themes
+                                highlightthickness=1,
+                                highlightbackground='#000000')
+            except Exception:
+                try:
+                    btn = ttk.Button(slot['inner'], text='', command=lambda s=state: on_panel_selected(s['name']))
+                except Exception:
+                    btn = None
+            if btn is not None:
+                # (font size, width chars) last applied by the scaling pass
+                btn._last_font_key = None
+            try:
+                attach_hover_tooltip(btn, lambda s=state: s['tip'])
+            except Exception:
+                pass
+            buttons.append((btn, state))
+        return buttons[idx]
+
+    # nav clicks only move the page state; one idle-time rebuild draws the
+    # result however many clicks land before Tk gets idle
+    pending_rebuild = {'count': PLACEHOLDERS_DEFAULT}
+    _rebuild_when_idle = _idle_once(lambda: rebuild_bundles(pending_rebuild['count']))
+
+    def _schedule_rebuild(count):
+        pending_rebuild['count'] = count
+        _rebuild_when_idle()
+
+    def _bundle_ctrl(slot):
+        ctrl = slot['ctrl']
+        if ctrl is None:
+            frame = tk.Frame(slot['bf'], bg=BUTTONS_BG)
+            ctrl = slot['ctrl'] = {'frame': frame, 'key': None, 'pages': 1, 'count': 5}
+            def go_prev(c=ctrl):
+                bk = c['key']
+                bundle_page_map[str(bk)] = max(0, bundle_page_map.get(str(bk), 0) - 1)
+                _schedule_rebuild(c['count'])
+            def go_next(c=ctrl):
+                bk = c['key']
+                bundle_page_map[str(bk)] = min(c['pages'] - 1, bundle_page_map.get(str(bk), 0) + 1)
+                _schedule_rebuild(c['count'])
+            try:
+                ctrl['prev'] = tk.Button(frame, text='◀', command=go_prev)
+                ctrl['next'] = tk.Button(frame, text='▶', command=go_next)
+                ctrl['label'] = tk.Label(frame, text='', bg=BUTTONS_BG)
+                ctrl['prev'].pack(side='left', padx=6, pady=2)
+                ctrl['label'].pack(side='left', expand=True)
+                ctrl['next'].pack(side='right', padx=6, pady=2)
+            except Exception:
+                pass
+        return ctrl
+
+    def _group_nav():
+        if not group_nav:
+            frame = tk.Frame(btn_grid, bg=BUTTONS_BG)
+            group_nav.update({'frame': frame, 'pages': 1, 'count': 5})
+            def go_prev_groups():
+                nonlocal bundle_group_page
+                bundle_group_page = max(0, bundle_group_page - 1)
+                _schedule_rebuild(group_nav['count'])
+            def go_next_groups():
+                nonlocal bundle_group_page
+                bundle_group_page = min(group_nav['pages'] - 1, bundle_group_page + 1)
+                _schedule_rebuild(group_nav['count'])
+            group_nav['prev'] = tk.Button(frame, text='◀ Bundles', command=go_prev_groups)
+            group_nav['label'] = tk.Label(frame, text='', bg=BUTTONS_BG)
+            group_nav['next'] = tk.Button(frame, text='Bundles ▶', command=go_next_groups)
+            group_nav['prev'].pack(side='left', padx=6, pady=2)
+            group_nav['label'].pack(side='left', expand=True)
+            group_nav['next'].pack(side='right', padx=6, pady=2)
+        return group_nav
+
     def rebuild_bundles(count: int):
-        for ch in btn_grid.winfo_children():
-            ch.destroy()
+        # hide every pooled tray/nav row; the branch below re-grids what it uses
+        pooled = [slot['bf'] for slot in bundle_pool] + empty_trays
+        if group_nav:
+            pooled.append(group_nav['frame'])
+        for w in pooled:
+            try:
+                w.grid_remove()
+            except Exception:
+                pass
         panel_button_widgets.clear()
 
         # Debug: record entry into rebuild
-        try:
-            log_debug(f"rebuild_bundles called - panels_loaded={panels_loaded}, current_panels={len(current_panels)}")
-        except Exception:
-            pass
+        if DEBUG:
+            try:
+                log_debug(f"rebuild_bundles called - panels_loaded={panels_loaded}, current_panels={len(current_panels)}")
+            except Exception:
+                pass
 
         # inner layout for panels per bundle: 4 cols x 4 rows
         # Use a fixed number of placeholders so widths remain stable across states
         placeholders = max(1, min(8, PLACEHOLDERS_DEFAULT))
         inner_cols = 4
         rows = 4
+        # (row, col) of each tray cell, filled left-to-right then top-to-bottom
+        grid_positions = [(i // inner_cols, i % inner_cols) for i in range(inner_cols * rows)]
+        # green area geometry, read once: nothing below runs the geometry
+        # manager, so it can't change until Tk goes idle anyway
+        try:
+            green_w = btns_frame.winfo_width()
+            green_h = btns_frame.winfo_height()
+        except Exception:
+            green_w = green_h = 0
 
         for c in range(placeholders):
             btn_grid.grid_columnconfigure(c, weight=1)
@@ -2335,30 +2643,14 @@ def make_gui():
             pass
 
         if panels_loaded and current_panels:
-            panels_by_name = current_panels
-            bundle_panels = {}
-            # collect panels by bundle key
-            for name, obj in panels_by_name.items():
-                bkey = None
-                display_label = None
-                if isinstance(obj, dict):
-                    bkey = obj.get('BundleGuid') or obj.get('BundleId') or obj.get('Bundle') or obj.get('BundleName') or obj.get('BundleLabel')
-                    display_label = obj.get('BundleName') or obj.get('Bundle') or obj.get('BundleLabel')
-                if not bkey:
-                    bkey = 'Bundle'
-                bundle_panels.setdefault(str(bkey), {'panels': [], 'label': display_label})['panels'].append(name)
-
-            # Produce a deterministic order for bundle placeholders. Prefer the
-            # captured display label if present; otherwise fall back to the key.
-            def _bundle_label_for_sort(k):
-                info = bundle_panels.get(k, {})
-                lbl = info.get('label') or str(k or '')
-                return _nat_key(lbl)
-            ordered_all = sorted(list(bundle_panels.keys()), key=_bundle_label_for_sort)
-            try:
-                log_debug(f"bundle_panels keys={list(bundle_panels.keys())} ordered_all={ordered_all}")
-            except Exception:
-                pass
+            index = _bundle_index()
+            bundle_panels = index['panels']
+            ordered_all = index['ordered']
+            if DEBUG:
+                try:
+                    log_debug(f"bundle_panels keys={list(bundle_panels.keys())} ordered_all={ordered_all}")
+                except Exception:
+                    pass
             total_groups = len(ordered_all)
             per_page_groups = placeholders
             group_pages = (total_groups + per_page_groups - 1) // per_page_groups if total_groups > 0 else 1
@@ -2375,36 +2667,38 @@ def make_gui():
             start_group = bp * per_page_groups
             end_group = start_group + per_page_groups
             ordered = ordered_all[start_group:end_group]
-            try:
-                log_debug(f"bundle page {bp}/{group_pages} start={start_group} end={end_group} ordered_slice={ordered}")
-            except Exception:
-                pass
+            if DEBUG:
+                try:
+                    log_debug(f"bundle page {bp}/{group_pages} start={start_group} end={end_group} ordered_slice={ordered}")
+                except Exception:
+                    pass
 
             for bi in range(placeholders):
                 bf_key = ordered[bi] if bi < len(ordered) else None
                 entry = bundle_panels.get(bf_key, {'panels': [], 'label': None})
                 # Always show numeric placeholders to avoid confusion with bundle keys/labels
                 label_text = f'Bundle {bi+1}'
-                try:
-                    log_debug(f"placeholder idx={bi} bf_key={bf_key} entry_panels_count={len(entry.get('panels', []))} entry_label={entry.get('label')}")
-                except Exception:
-                    pass
+                if DEBUG:
+                    try:
+                        log_debug(f"placeholder idx={bi} bf_key={bf_key} entry_panels_count={len(entry.get('panels', []))} entry_label={entry.get('label')}")
+                    except Exception:
+                        pass
                 # Use a plain Frame for bundle trays to avoid platform/theme
                 # rendering quirks with LabelFrame that can sometimes obscure
                 # child widgets on Windows. Add an explicit header label so
                 # bundle titles remain visible.
-                bf = tk.Frame(btn_grid, bg=BUTTONS_BG)
+                slot = _bundle_slot(bi)
+                bf = slot['bf']
                 # Header inside the frame (keeps thin and consistent)
                 try:
-                    hdr = tk.Label(bf, text=label_text, bg=BUTTONS_BG, font=('Arial', 9, 'bold'))
-                    hdr.pack(side='top', fill='x')
+                    slot['hdr'].configure(text=label_text)
                 except Exception:
                     pass
                 bf.grid(row=0, column=bi, sticky='nsew', padx=4, pady=4)
                 try:
                     bf.grid_propagate(False)
-                    bf.configure(height=max(88, btns_frame.winfo_height() - 16))
-                    bf.configure(width=btns_frame.winfo_width() // max(1, placeholders) - 8)
+                    bf.configure(height=max(88, green_h - 16))
+                    bf.configure(width=green_w // max(1, placeholders) - 8)
                 except Exception:
                     pass
                 # Ensure bf uses a 2-row grid: row0 for the 4x4 inner grid (expand),
@@ -2416,13 +2710,8 @@ def make_gui():
                 except Exception:
                     pass
 
-                # get panels for this bundle key
-                panels_for = list(entry.get('panels', []))
-                # Sort panels numerically by trailing panel number (e.g. '07_112' -> 112)
-                try:
-                    panels_for = sorted(panels_for, key=lambda name: _panel_sort_key(current_panels.get(name, name)))
-                except Exception:
-                    panels_for.sort()
+                # panels for this bundle key, already in panel-number order
+                panels_for = entry.get('panels', [])
 
                 # Pagination inside bundle: pages of 16 panels
                 total = len(panels_for)
@@ -2437,16 +2726,17 @@ def make_gui():
 
                 start = page_idx * per_page
                 page_panels = panels_for[start:start+per_page]
-                try:
-                    log_debug(f"bf_key={bf_key} total_panels={total} per_page={per_page} pages={pages} page_idx={page_idx} page_panels={page_panels}")
-                except Exception:
-                    pass
+                if DEBUG:
+                    try:
+                        log_debug(f"bf_key={bf_key} total_panels={total} per_page={per_page} pages={pages} page_idx={page_idx} page_panels={page_panels}")
+                    except Exception:
+                        pass
 
                 # inner grid - compute pixel sizes so we can reserve space for page controls
-                inner = tk.Frame(bf, bg=BUTTONS_BG)
+                inner = slot['inner']
                 try:
                     # base per-bundle height slice from the green area
-                    per_bundle_h = max(88, int(btns_frame.winfo_height() - 16) if btns_frame.winfo_height() else DEFAULT_STATE.get('green_h', 264))
+                    per_bundle_h = max(88, int(green_h - 16) if green_h else DEFAULT_STATE.get('green_h', 264))
                 except Exception:
                     per_bundle_h = DEFAULT_STATE.get('green_h', 264)
 
@@ -2457,7 +2747,7 @@ def make_gui():
 
                 # derive cell sizes from inner_h and per-bundle width
                 try:
-                    btns_w = btns_frame.winfo_width() or btn_grid.winfo_reqwidth() or DEFAULT_STATE.get('green_w', 1440)
+                    btns_w = green_w or btn_grid.winfo_reqwidth() or DEFAULT_STATE.get('green_w', 1440)
                     cols_eff = max(1, placeholders)
                     # Aim for a visible bundle tray approx 280px wide and ~248px tall (including control row subtraction)
                     target_bundle_w = 280
@@ -2488,6 +2778,22 @@ def make_gui():
                 except Exception:
                     safe_bf_h = per_bundle_h
 
+                if bf_key is None:
+                    # empty slot past the last bundle: keep the sized, titled tray
+                    # but skip placement, cell layout and buttons entirely
+                    for b, _ in slot['buttons']:
+                        try:
+                            b.grid_remove()
+                        except Exception:
+                            pass
+                    if slot['ctrl'] is not None:
+                        try:
+                            slot['ctrl']['frame'].grid_forget()
+                            slot['ctrl']['frame'].place_forget()
+                        except Exception:
+                            pass
+                    continue
+
                 # Defer placement until bf has an accurate measured size so controls
                 # and inner grid are placed correctly. Use bf.after to schedule.
                 def place_inner_and_controls():
@@ -2541,11 +2847,12 @@ def make_gui():
                                 overlay.create_text(cx+8, cy+4, anchor='nw', text=f'Ctrl {cw}x{ch}', fill='red', font=('Arial', 8))
                             except Exception:
                                 pass
-                        try:
-                            # log measured sizes for diagnostics
-                            log_debug(f"measured bf idx={bi} bf_key={bf_key} measured_bf_w={measured_bf_w} measured_bf_h={measured_bf_h} inner_w={iw} inner_h={ih}")
-                        except Exception:
-                            pass
+                        if DEBUG:
+                            try:
+                                # log measured sizes for diagnostics
+                                log_debug(f"measured bf idx={bi} bf_key={bf_key} measured_bf_w={measured_bf_w} measured_bf_h={measured_bf_h} inner_w={iw} inner_h={ih}")
+                            except Exception:
+                                pass
                     except Exception:
                         try:
                             inner.place(relx=0.02, rely=0.02, relwidth=0.96, relheight=0.80)
@@ -2558,8 +2865,10 @@ def make_gui():
                 # Optional debug overlay canvas (deferred drawing will update it)
                 if SHOW_DEBUG_BOUNDS:
                     try:
-                        overlay = tk.Canvas(bf, bg='', highlightthickness=0)
-                        overlay.place(relx=0, rely=0, relwidth=1.0, relheight=1.0)
+                        overlay = slot['overlay']
+                        if overlay is None:
+                            overlay = slot['overlay'] = tk.Canvas(bf, bg='', highlightthickness=0)
+                            overlay.place(relx=0, rely=0, relwidth=1.0, relheight=1.0)
                         # ensure overlay sits behind interactive widgets
                         try:
                             overlay.lower()
@@ -2568,264 +2877,178 @@ def make_gui():
                     except Exception:
                         overlay = None
 
-                # Ensure all grid rows/columns are configured so cells expand evenly
-                for r in range(rows):
+                # Configure all grid rows/columns so cells expand evenly, with
+                # minimum sizes so buttons can't grow (raised for legibility).
+                # The pooled inner frame keeps them, so only redo on a change.
+                cell_w = max(cell_w, 50)
+                cell_h = max(cell_h, 40)
+                if slot.get('cells') != (cell_w, cell_h):
                     try:
-                        inner.grid_rowconfigure(r, weight=1)
-                    except Exception:
-                        pass
-                for c in range(inner_cols):
-                    try:
-                        inner.grid_columnconfigure(c, weight=1)
-                    except Exception:
-                        pass
-
-                    # Enforce minimum sizes on the inner grid cells so buttons can't grow
-                    try:
-                        # raise minimums for better legibility
-                        cell_w = max(cell_w, 50)
-                        cell_h = max(cell_h, 40)
                         for cc in range(inner_cols):
                             inner.grid_columnconfigure(cc, weight=1, minsize=cell_w)
                         for rr in range(rows):
                             inner.grid_rowconfigure(rr, weight=1, minsize=cell_h)
+                        slot['cells'] = (cell_w, cell_h)
                     except Exception:
                         pass
 
-                max_buttons_per_row = inner_cols
+                btn_diag = []
                 for idx, panel_name in enumerate(page_panels):
                     obj = current_panels.get(panel_name, {})
                     display_name = obj.get('DisplayLabel', panel_name)
-                    # compute short panel label for buttons: prefer the last 3 digits
-                    def _button_text_from_display(name):
-                        try:
-                            s = str(name or '')
-                            # prefer digits: find last continuous digit sequence
-                            m = re.findall(r"(\d+)", s)
-                            if m:
-                                seq = m[-1]
-                                return seq[-3:]
-                            # fallback: use suffix after last '_' then last 3 chars
-                            if '_' in s:
-                                suf = s.rsplit('_', 1)[1]
-                                return suf[-3:]
-                            return s[-3:]
-                        except Exception:
-                            return str(name)
+                    # short panel label for buttons: prefer the last 3 digits
                     panel_num = _button_text_from_display(display_name)
-                    # Create small fixed-size buttons like `oldd.py` so they
-                    # reliably fit into the 4x4 tray and remain visible across
-                    # themes. Use a small bold tk Font and explicit bg/fg. Fall
-                    # back to ttk.Button only if tk.Button fails.
-                    try:
-                        try:
-                            # Slightly larger font to improve legibility
-                            small_font = tkfont.Font(size=9, weight='bold')
-                        except Exception:
-                            small_font = None
-                        btn = tk.Button(inner,
-                                        text=panel_num,
-                                        font=small_font,
-                                        relief='raised',
-                                        bd=3,
-                                        anchor='center',
-                                        command=lambda n=panel_name: on_panel_selected(n),
-                                        width=6,
-                                        height=2,
-                                        wraplength=80,
-                                        bg='#2e8b57',
-                                        fg='#ffffff',
-                                        activebackground='#66ff99',
-                                        activeforeground='#000000')
-                    except Exception:
-                        try:
-                            btn = ttk.Button(inner, text=panel_num, command=lambda n=panel_name: on_panel_selected(n))
-                        except Exception:
-                            btn = None
-                    try:
-                        attach_hover_tooltip(btn, lambda n=panel_name, d=display_name: d)
-                    except Exception:
-                        pass
-
-                    # Compute row/col for this button. Always fill left-to-right,
-                    # top-to-bottom so positions 1..16 map to the 4x4 grid cells
-                    # in order (row=0,col=0) .. (row=3,col=3).
-                    row = idx // max_buttons_per_row
-                    col = idx % max_buttons_per_row
-                    # Always place buttons into the fixed 4x4 grid cells so each
-                    # button uses the same default size
+                    # Small fixed-size buttons like `oldd.py` so they reliably
+                    # fit into the 4x4 tray; pooled per slot and re-labelled here.
+                    btn, btn_state = _slot_button(slot, idx)
+                    btn_state['name'] = panel_name
+                    btn_state['tip'] = display_name
+
+                    # Positions 1..16 map to the 4x4 grid cells in order
+                    # (row=0,col=0) .. (row=3,col=3).
+                    row, col = grid_positions[idx]
                     try:
+                        # one configure per button
+                        btn.configure(text=panel_num, bg='#2e8b57', fg='#ffffff')
+                        # Always place buttons into the fixed 4x4 grid cells so each
+                        # button uses the same default size (never pack: it breaks
+                        # the cell layout)
                         btn.grid(row=row, column=col, sticky='nsew', padx=2, pady=2)
                     except Exception:
-                        # If grid fails, silently continue; do not pack as that breaks cell layout
-                        pass
-                    try:
-                        # Diagnostic: log the button's text and mapping/visibility state
-                        txt = None
+                        # ttk fallback button (no bg/fg) or a failed grid
                         try:
-                            txt = btn.cget('text')
-                        except Exception:
-                            try:
-                                txt = str(btn)
-                            except Exception:
-                                txt = '<unknown>'
-                        mapped = False
-                        viewable = False
-                        try:
-                            mapped = bool(btn.winfo_ismapped())
-                            viewable = bool(btn.winfo_viewable())
+                            btn.configure(text=panel_num)
+                            btn.grid(row=row, column=col, sticky='nsew', padx=2, pady=2)
                         except Exception:
                             pass
+                    if DEBUG:
+                        # Diagnostic: the button's mapping/visibility state, logged
+                        # once per tray below
                         try:
-                            log_debug(f"created_button text={txt} mapped={mapped} viewable={viewable} row={row} col={col} bf_w={bf.winfo_width()} bf_h={bf.winfo_height()} inner_w={inner.winfo_width()} inner_h={inner.winfo_height()}")
+                            btn_diag.append(f"{panel_num}@{row},{col} mapped={bool(btn.winfo_ismapped())} viewable={bool(btn.winfo_viewable())}")
                         except Exception:
-                            try:
-                                log_debug(f"created_button text={txt} mapped={mapped} viewable={viewable} row={row} col={col}")
-                            except Exception:
-                                pass
+                            btn_diag.append(f"{panel_num}@{row},{col}")
+                    panel_button_widgets.append(btn)
+                    # row/column weights already configured above for all cells
+                if DEBUG and btn_diag:
+                    try:
+                        log_debug(f"placeholder idx={bi} buttons bf_w={bf.winfo_width()} bf_h={bf.winfo_height()} inner_w={inner.winfo_width()} inner_h={inner.winfo_height()} {' | '.join(btn_diag)}")
                     except Exception:
                         pass
-                    panel_button_widgets.append(btn)
-                    # Ensure the button is visually prominent across themes
+
+                # Hide pooled buttons past this page; the cell minsizes above keep
+                # the grid at fixed positions with nothing drawn in empty cells.
+                shown = [b for b, _ in slot['buttons'][:len(page_panels)]]
+                for b, _ in slot['buttons'][len(page_panels):]:
                     try:
-                        btn.configure(highlightthickness=1, highlightbackground='#000000')
-                        try:
-                            btn.lift()
-                        except Exception:
-                            pass
+                        b.grid_remove()
                     except Exception:
                         pass
-                    # row/column weights already configured above for all cells
 
-                # Fill remaining cells with invisible frames so the grid keeps fixed positions
-                # but no visible placeholder artifacts are shown.
+                # ensure overlay canvas is sent to back so it cannot obscure buttons
                 try:
-                    per_page = inner_cols * rows
-                    for empty_idx in range(len(page_panels), per_page):
-                        er = empty_idx // inner_cols
-                        ec = empty_idx % inner_cols
-                        try:
-                            # invisible frame matching bundle BG so empty cells look empty
-                            ph = tk.Frame(inner, bg=BUTTONS_BG)
-                            ph.grid(row=er, column=ec, sticky='nsew', padx=2, pady=2)
-                        except Exception:
-                            pass
+                    if SHOW_DEBUG_BOUNDS and overlay is not None:
+                        overlay.lower()
                 except Exception:
                     pass
-
-                try:
-                    # ensure overlay canvas is sent to back so it cannot obscure buttons
+                if DEBUG:
                     try:
-                        if SHOW_DEBUG_BOUNDS and overlay is not None:
-                            overlay.lower()
-                    except Exception:
-                        pass
-                    # diagnostic: how many children does inner have now?
-                    cc = len(inner.winfo_children())
-                    log_debug(f"placeholder idx={bi} bf_key={bf_key} inner_children_after_place={cc} expected_buttons={len(page_panels)}")
-                    # list child widget types/text where possible
-                    try:
-                        details = []
-                        for ch in inner.winfo_children():
-                            try:
-                                cls = ch.winfo_class()
-                                txt = ''
+                        # diagnostic: how many buttons does inner show now?
+                        cc = len(shown)
+                        log_debug(f"placeholder idx={bi} bf_key={bf_key} inner_children_after_place={cc} expected_buttons={len(page_panels)}")
+                        # list child widget types/text where possible
+                        try:
+                            details = []
+                            for ch in shown:
                                 try:
-                                    txt = ch.cget('text')
-                                except Exception:
+                                    cls = ch.winfo_class()
+                                    txt = ''
                                     try:
-                                        # ttk widgets may store text differently
-                                        txt = str(ch)
+                                        txt = ch.cget('text')
                                     except Exception:
-                                        txt = ''
-                                details.append(f"{cls}:{txt}")
-                            except Exception:
-                                continue
-                        if details:
-                            log_debug(f"placeholder idx={bi} children_detail={'|'.join(details)}")
+                                        try:
+                                            # ttk widgets may store text differently
+                                            txt = str(ch)
+                                        except Exception:
+                                            txt = ''
+                                    details.append(f"{cls}:{txt}")
+                                except Exception:
+                                    continue
+                            if details:
+                                log_debug(f"placeholder idx={bi} children_detail={'|'.join(details)}")
+                        except Exception:
+                            pass
                     except Exception:
                         pass
-                except Exception:
-                    pass
 
                 # per-bundle page controls
                 if pages > 1:
-                    ctrl = tk.Frame(bf, bg=BUTTONS_BG)
+                    ctrl = _bundle_ctrl(slot)
+                    ctrl.update(key=bf_key, pages=pages, count=count)
                     # place page controls at the bottom using fixed pixel height
                     try:
                         # Grid the controls into the reserved second row so they remain
                         # anchored to the bottom of the bundle frame and never overlap
                         # the inner 4x4 grid. Use sticky 'ew' so it stretches horizontally.
-                        ctrl.grid(row=1, column=0, sticky='ew', padx=4, pady=(2, bottom_padding))
+                        ctrl['frame'].grid(row=1, column=0, sticky='ew', padx=4, pady=(2, bottom_padding))
                     except Exception:
                         try:
-                            ctrl.place(relx=0.02, rely=0.84, relwidth=0.96, relheight=0.14)
+                            ctrl['frame'].place(relx=0.02, rely=0.84, relwidth=0.96, relheight=0.14)
                         except Exception:
                             pass
-                    def make_nav(bk, pages_count):
-                        def go_prev():
-                            bundle_page_map[str(bk)] = max(0, bundle_page_map.get(str(bk), 0) - 1)
-                            rebuild_bundles(count)
-                        def go_next():
-                            bundle_page_map[str(bk)] = min(pages_count - 1, bundle_page_map.get(str(bk), 0) + 1)
-                            rebuild_bundles(count)
-                        return go_prev, go_next
-                    prev_cb, next_cb = make_nav(bf_key, pages)
                     try:
-                        pbtn = tk.Button(ctrl, text='◀', command=prev_cb)
-                        nbtn = tk.Button(ctrl, text='▶', command=next_cb)
-                        lbl = tk.Label(ctrl, text=f'Page {page_idx+1}/{pages}', bg=BUTTONS_BG)
-                        pbtn.configure(bg='#ffeb99' if page_idx > 0 else BUTTONS_BG)
-                        nbtn.configure(bg='#ffeb99' if page_idx < (pages-1) else BUTTONS_BG)
-                        pbtn.pack(side='left', padx=6, pady=2)
-                        lbl.pack(side='left', expand=True)
-                        nbtn.pack(side='right', padx=6, pady=2)
+                        ctrl['label'].configure(text=f'Page {page_idx+1}/{pages}')
+                        ctrl['prev'].configure(bg='#ffeb99' if page_idx > 0 else BUTTONS_BG)
+                        ctrl['next'].configure(bg='#ffeb99' if page_idx < (pages-1) else BUTTONS_BG)
+                    except Exception:
+                        pass
+                elif slot['ctrl'] is not None:
+                    try:
+                        slot['ctrl']['frame'].grid_forget()
+                        slot['ctrl']['frame'].place_forget()
                     except Exception:
                         pass
 
             # global bundle group navigation if needed
             try:
                 if group_pages > 1:
-                    nav = tk.Frame(btn_grid, bg=BUTTONS_BG)
-                    nav.grid(row=1, column=0, columnspan=placeholders, sticky='ew', padx=4, pady=(2,0))
-                    def go_prev_groups():
-                        nonlocal bundle_group_page
-                        bundle_group_page = max(0, bundle_group_page - 1)
-                        rebuild_bundles(count)
-                    def go_next_groups():
-                        nonlocal bundle_group_page
-                        bundle_group_page = min(group_pages - 1, bundle_group_page + 1)
-                        rebuild_bundles(count)
-                    pbtn = tk.Button(nav, text='◀ Bundles', command=go_prev_groups)
-                    lbl = tk.Label(nav, text=f'Bundles: {bundle_group_page+1}/{group_pages}', bg=BUTTONS_BG)
-                    nbtn = tk.Button(nav, text='Bundles ▶', command=go_next_groups)
-                    pbtn.configure(bg='#ffeb99' if bundle_group_page > 0 else BUTTONS_BG)
-                    nbtn.configure(bg='#ffeb99' if bundle_group_page < (group_pages-1) else BUTTONS_BG)
-                    pbtn.pack(side='left', padx=6, pady=2)
-                    lbl.pack(side='left', expand=True)
-                    nbtn.pack(side='right', padx=6, pady=2)
+                    nav = _group_nav()
+                    nav.update(pages=group_pages, count=count)
+                    nav['frame'].grid(row=1, column=0, columnspan=placeholders, sticky='ew', padx=4, pady=(2,0))
+                    nav['label'].configure(text=f'Bundles: {bundle_group_page+1}/{group_pages}')
+                    nav['prev'].configure(bg='#ffeb99' if bundle_group_page > 0 else BUTTONS_BG)
+                    nav['next'].configure(bg='#ffeb99' if bundle_group_page < (group_pages-1) else BUTTONS_BG)
             except Exception:
                 pass
             # After constructing this page of bundles, scale button fonts and enforce
             # equal visual widths across all panel buttons so trays look consistent.
             try:
-                btns_w = btns_frame.winfo_width() or btn_grid.winfo_reqwidth() or 600
+                btns_w = green_w or btn_grid.winfo_reqwidth() or 600
                 cols_eff = max(1, min(placeholders, len(ordered)))
                 per_bundle_w = max(40, int((btns_w - (cols_eff * 12)) / max(1, cols_eff)))
                 # choose font size proportional to per-bundle width (similar to buttons.py)
                 fw = max(7, min(12, per_bundle_w // 30))
-                btn_font = tkfont.Font(size=fw)
+                btn_font = _sized_font(fw)
                 # measure average character width for this font to convert pixels->chars
-                try:
-                    char_w = tkfont.Font(font=btn_font).measure('0') or 8
-                except Exception:
-                    char_w = 8
+                char_w = _char_widths.get(fw)
+                if char_w is None:
+                    try:
+                        char_w = btn_font.measure('0') or 8
+                    except Exception:
+                        char_w = 8
+                    _char_widths[fw] = char_w
                 # target button pixel width is a fraction of the per-bundle width
                 target_btn_px = max(20, int(per_bundle_w * 0.18))
                 target_btn_chars = max(2, int(target_btn_px / max(1, char_w)))
+                # pooled buttons usually already have this size from the last
+                # page, so only reconfigure the ones that differ
+                font_key = (fw, target_btn_chars)
                 for w in panel_button_widgets:
+                    if getattr(w, '_last_font_key', None) == font_key:
+                        continue
                     try:
                         w.configure(font=btn_font, width=target_btn_chars)
+                        w._last_font_key = font_key
                     except Exception:
                         pass
             except Exception:
@@ -2833,121 +3056,95 @@ def make_gui():
         else:
             # no panels loaded yet: render empty placeholders
             for bi in range(placeholders):
-                bf = tk.LabelFrame(btn_grid, text=f'Bundle {bi+1}', bg=BUTTONS_BG)
+                if bi >= len(empty_trays):
+                    bf = tk.LabelFrame(btn_grid, text=f'Bundle {bi+1}', bg=BUTTONS_BG)
+                    empty_trays.append(bf)
+                    try:
+                        placeholder = tk.Label(bf, text='', bg=BUTTONS_BG)
+                        placeholder.pack(expand=True, fill='both')
+                    except Exception:
+                        pass
+                bf = empty_trays[bi]
                 bf.grid(row=0, column=bi, sticky='nsew', padx=4, pady=4)
                 try:
                     bf.grid_propagate(False)
-                    bf.configure(height=max(44, btns_frame.winfo_height() - 16))
-                except Exception:
-                    pass
-                try:
-                    placeholder = tk.Label(bf, text='', bg=BUTTONS_BG)
-                    placeholder.pack(expand=True, fill='both')
+                    bf.configure(height=max(44, green_h - 16))
                 except Exception:
                     pass
 
     rebuild_bundles(5)
 
     def process_selected_ehx(evt=None):
-        nonlocal panels_loaded
+        # selection and folder are read once and shared by the log line and the load
+        sel = file_listbox.curselection()
+        fname = file_listbox.get(sel[0]) if sel else None
+        folder = folder_entry.get() or os.getcwd()
         try:
             # Diagnostic: record that the handler was invoked and current selection/folder
-            sel_dbg = file_listbox.curselection()
-            try:
-                sel_txt = file_listbox.get(sel_dbg[0]) if sel_dbg else '<none>'
-            except Exception:
-                sel_txt = '<error>'
-            try:
-                fentry = folder_entry.get() or os.getcwd()
-            except Exception:
-                fentry = os.getcwd()
-            try:
-                log_debug(f"process_selected_ehx invoked sel={sel_dbg} sel_txt={sel_txt} folder_entry={fentry}")
-            except Exception:
-                pass
+            log_debug(f"process_selected_ehx invoked sel={sel} sel_txt={fname or '<none>'} folder_entry={folder}")
         except Exception:
             pass
-        sel = file_listbox.curselection()
         if not sel:
             return
-        fname = file_listbox.get(sel[0])
-        folder = folder_entry.get() or os.getcwd()
         full = os.path.join(folder, fname)
         # Prefer using a local PV0825 parser if present near the EHX file for exact parity
-        pv_mod = None
+        pv_mod = _find_pv0825(folder) if USE_PV0825 else None
+
+        parse_job['seq'] += 1
+        # reselecting an unchanged file reuses its earlier parse
+        key = _parse_cache_key(full)
+        cached = _parse_cache.get(key) if key is not None else None
+        if cached is not None:
+            # a fresh copy, so a reselect starts from the same dicts a parse gives
+            _apply_parsed(full, fname, *_copy_parsed(*cached))
+            return
+        # Parse on the worker thread so the window keeps repainting during
+        # big files; _poll_parse applies the result back on the Tk thread.
+        fut = _parse_pool.submit(_parse_ehx, full, pv_mod)
+        root.after(PARSE_POLL_MS, _poll_parse, fut, parse_job['seq'], full, fname, key)
+
+    # bumped per selection so only the latest parse result is applied
+    parse_job = {'seq': 0}
+
+    def _poll_parse(fut, seq, full, fname, key):
+        if not fut.done():
+            root.after(PARSE_POLL_MS, _poll_parse, fut, seq, full, fname, key)
+            return
         try:
-            # Temporarily disabled to test local parser
-            raise Exception("Testing local parser - skipping PV0825 search")
-            candidates = [
-                os.path.join(folder, 'PV0825.py'),
-                os.path.join(folder, 'Expected', 'PV0825.py'),
-                os.path.join(folder, 'Working', 'PV0825.py'),
-                os.path.join(folder, 'Working', 'Expected', 'PV0825.py'),
-                os.path.join(HERE, 'PV0825.py'),
-                os.path.join(HERE, 'Working', 'PV0825.py'),
-                os.path.join(HERE, 'Working', 'Expected', 'PV0825.py'),
-            ]
-            import importlib.util
-            for c in candidates:
-                try:
-                    if c and os.path.exists(c):
-                        spec = importlib.util.spec_from_file_location('PV0825_local', c)
-                        mod = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(mod)
-                        pv_mod = mod
-                        break
-                except Exception:
-                    pv_mod = None
+            panels, materials_map = fut.result()
         except Exception:
-            pv_mod = None
+            panels, materials_map = [], {}
+        if key is not None and panels:
+            # cache a copy taken before _apply_parsed/the GUI touch these dicts
+            _parse_cache[key] = _copy_parsed(panels, materials_map)
+            if len(_parse_cache) > _PARSE_CACHE_MAX:
+                _parse_cache.pop(next(iter(_parse_cache)))
+        if seq != parse_job['seq']:
+            # a newer selection superseded this one
+            return
+        _apply_parsed(full, fname, panels, materials_map)
 
-        if pv_mod and hasattr(pv_mod, 'parse_panels'):
-            try:
-                panels, materials_map = pv_mod.parse_panels(full) or ([], {})
-            except Exception:
-                panels, materials_map = [], {}
-        else:
-            try:
-                try:
-                    log_debug(f"process_selected_ehx about to call parse_panels for {full}")
-                except Exception:
-                    pass
-                panels, materials_map = parse_panels(full) or ([], {})
-                try:
-                    if not panels:
-                        log_debug(f"parse_panels returned empty, falling back to parse_panels_minimal for {full}")
-                        panels, materials_map = parse_panels_minimal(full) or ([], {})
-                        log_debug(f"parse_panels_minimal returned count={len(panels)}")
-                except Exception:
-                    pass
-                try:
-                    # Diagnostic: log what parse_panels returned
-                    ptype = type(panels).__name__
-                    pcount = len(panels) if hasattr(panels, '__len__') else 0
-                    try:
-                        sample = panels[:6] if isinstance(panels, (list, tuple)) else list(panels.keys())[:6]
-                    except Exception:
-                        sample = None
-                    log_debug(f"parse result type={ptype} count={pcount} sample={sample}")
-                except Exception:
-                    pass
-            except Exception:
-                panels, materials_map = [], {}
-        panels_by_name = {}
+    def _apply_parsed(full, fname, panels, materials_map):
+        nonlocal panels_loaded
         if isinstance(panels, dict):
-            panels_by_name.update(panels)
+            panels_by_name = dict(panels)
         else:
-            for p in panels or []:
-                if not p:
-                    continue
-                # Use the Name field (PanelGuid) as the internal key
-                name = p.get('Name')
-                if not name:
-                    name = f"Panel_{len(panels_by_name)+1}"
-                panels_by_name[name] = p
+            # Use the Name field (PanelGuid) as the internal key; nameless
+            # panels get a positional Panel_N like the parsers use
+            panels_by_name = {(p.get('Name') or f"Panel_{i+1}"): p
+                              for i, p in enumerate(panels or []) if p}
+        # resolve each panel's bundle key/label once for rebuild_bundles
+        for obj in panels_by_name.values():
+            if isinstance(obj, dict):
+                obj['_bkey'] = str(obj.get('BundleGuid') or obj.get('BundleId') or obj.get('Bundle') or obj.get('BundleName') or obj.get('BundleLabel') or 'Bundle')
+                obj['_bundle_label'] = obj.get('BundleName') or obj.get('Bundle') or obj.get('BundleLabel')
 
         current_panels.clear(); current_panels.update(panels_by_name)
+        panel_sort_keys.clear()
+        bundle_index.clear()
         panel_materials_map.clear()
+        _filter_cache.clear()
+        _aff_cache.clear()
         if isinstance(materials_map, dict):
             for k, v in materials_map.items():
                 panel_materials_map[k] = v or []
@@ -2971,36 +3168,13 @@ def make_gui():
                 log_debug(f"calling writer for file={full} writer={'external' if writer is not None else 'none'})")
             except Exception:
                 pass
-            try:
-                writer(full, panels_by_name, panel_materials_map)
-                try:
-                    log_debug(f"writer completed for {full}")
-                except Exception:
-                    pass
-            except Exception as we:
-                try:
-                    log_debug(f"writer failed for {full} exception={we}")
-                except Exception:
-                    pass
-                # last-resort: attempt best-effort write using local helpers
-                try:
-                    import datetime as _dt
-                    ts = _dt.datetime.now(_dt.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
-                    folder = os.path.dirname(full)
-                    fname = os.path.basename(full)
-                    with open(os.path.join(folder, 'expected.log'), 'w', encoding='utf-8') as _fh:
-                        _fh.write(f"=== expected.log cleared at {ts} for {fname} ===\n")
-                    with open(os.path.join(folder, 'materials.log'), 'w', encoding='utf-8') as _fh:
-                        _fh.write(f"=== materials.log cleared at {ts} for {fname} ===\n")
-                    try:
-                        log_debug(f"fallback writer created minimal logs for {full}")
-                    except Exception:
-                        pass
-                except Exception as fe:
-                    try:
-                        log_debug(f"fallback writer failed for {full} exception={fe}")
-                    except Exception:
-                        pass
+            # the logs are written on the worker, queued behind any parse. The
+            # writer gets its own copies of the panel and material dicts: the GUI
+            # keeps using (and caching into) the originals on the Tk thread
+            panels_snap = {k: dict(v) if isinstance(v, dict) else v for k, v in panels_by_name.items()}
+            mats_snap = {k: [dict(m) if isinstance(m, dict) else m for m in (v or [])]
+                         for k, v in panel_materials_map.items()}
+            _parse_pool.submit(_write_ehx_logs, writer, full, panels_snap, mats_snap)
         except Exception as e:
             try:
                 log_debug(f"exception around writer block for {full} exception={e}")
@@ -3010,23 +3184,14 @@ def make_gui():
         panels_loaded = True
         rebuild_bundles(5)
         # After rebuild, schedule a short task to ensure buttons are visible
+        # one raise per tray keeps each button grid above the header/controls;
+        # the buttons keep the green scheme rebuild_bundles gave them
         def _ensure_buttons_visible():
-            try:
-                for w in list(panel_button_widgets):
-                    try:
-                        if w:
-                            try:
-                                w.configure(bg='#ffffff', fg='#000000')
-                            except Exception:
-                                pass
-                            try:
-                                w.lift()
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            for slot in bundle_pool:
+                try:
+                    slot['inner'].tkraise()
+                except Exception:
+                    pass
 
         try:
             root.after(180, _ensure_buttons_visible)
@@ -3039,26 +3204,18 @@ def make_gui():
     file_listbox.bind('<Double-Button-1>', process_selected_ehx)
 
     # Lock/Reset shortcuts
-    def save_state(state):
-        try:
-            with open(STATE_FILE, 'w', encoding='utf-8') as fh:
-                json.dump(state, fh, indent=2)
-        except Exception:
-            pass
-
+    # state file writes/removes go through the single parse worker so they
+    # stay in click order and off the Tk thread
     def toggle_lock_view():
         try:
             st = {'left_w': left.winfo_width(), 'details_w': details_outer.winfo_width(), 'breakdown_w': breakdown_outer.winfo_width(), 'green_h': btns_frame.winfo_height()}
-            save_state(st)
-            with open(LOG_FILE, 'a', encoding='utf-8') as fh:
-                fh.write(json.dumps({'ts': _dt.datetime.now(_dt.timezone.utc).isoformat(), 'action': 'lock', 'state': st}) + '\n')
+            _parse_pool.submit(_persist_lock_state, st)
         except Exception:
             pass
 
     def reset_view():
         try:
-            if os.path.exists(STATE_FILE):
-                os.remove(STATE_FILE)
+            _parse_pool.submit(_clear_state_file)
         except Exception:
             pass
         try:
@@ -3069,8 +3226,17 @@ def make_gui():
         except Exception:
             pass
 
-    root.after(100, lambda: (center_details_content(), center_breakdown_content()))
-    root.after(500, lambda: (center_details_content(), center_breakdown_content()))
+    # one startup centering pass; flush pending geometry first instead of
+    # scheduling a second, later pass in case the first ran too early
+    def _initial_center():
+        try:
+            root.update_idletasks()
+        except Exception:
+            pass
+        center_details_content()
+        center_breakdown_content()
+
+    root.after(200, _initial_center)
 
     return root
 
@@ -15,23 +15,21 @@ try:
             print(i, 'Name=', p.get('Name'), 'DisplayLabel=', p.get('DisplayLabel'), 'Bundle=', p.get('Bundle') or p.get('BundleName') or p.get('BundleGuid'))
     print('MATERIALS keys sample:', list(mats.keys())[:10])
     # compute bundles mapping as rebuild_bundles does
-    panels_by_name = {}
     if isinstance(panels, dict):
-        panels_by_name.update(panels)
+        panels_by_name = dict(panels)
     else:
-        for p in panels or []:
-            if not p:
-                continue
-            name = p.get('Name') or f"Panel_{len(panels_by_name)+1}"
-            panels_by_name[name] = p
+        panels_by_name = {(p.get('Name') or f"Panel_{i+1}"): p for i, p in enumerate(panels or []) if p}
     bundle_panels = {}
     for name,obj in panels_by_name.items():
         bkey = None
         if isinstance(obj, dict):
             bkey = obj.get('BundleGuid') or obj.get('BundleId') or obj.get('Bundle') or obj.get('BundleName') or obj.get('BundleLabel')
-        if not bkey:
-            bkey = 'Bundle'
-        bundle_panels.setdefault(str(bkey), {'panels': [], 'label': obj.get('BundleName') or obj.get('Bundle') or obj.get('BundleLabel')}).get('panels').append(name)
+        bkey = str(bkey or 'Bundle')
+        group = bundle_panels.get(bkey)
+        if group is None:
+            # label comes from the first panel seen in the bundle
+            group = bundle_panels[bkey] = {'panels': [], 'label': obj.get('BundleName') or obj.get('Bundle') or obj.get('BundleLabel')}
+        group['panels'].append(name)
     print('BUNDLE groups count:', len(bundle_panels))
     for k, v in bundle_panels.items():
         print('KEY:', k, 'label:', v.get('label'), 'count:', len(v.get('panels')))
@@ -16,17 +16,10 @@ try:
 except Exception as e:
     print('parse_panels error:', e)
     sys.exit(1)
-panels_by_name = {}
 if isinstance(panels, dict):
-    panels_by_name.update(panels)
+    panels_by_name = dict(panels)
 else:
-    from collections import OrderedDict
-    panels_by_name = OrderedDict()
-    for p in panels or []:
-        if not p:
-            continue
-        name = p.get('Name') or p.get('DisplayLabel') or f"Panel_{len(panels_by_name)+1}"
-        panels_by_name[name] = p
+    panels_by_name = {(p.get('Name') or p.get('DisplayLabel') or f"Panel_{i+1}"): p for i, p in enumerate(panels or []) if p}
 print('Total panels parsed:', len(panels_by_name))
 bundle_panels = {}
 for name, obj in panels_by_name.items():